@@ -86,7 +86,7 @@ async def _check_rate_limit(key: str, max_requests: int, window: int) -> tuple[b
 def _get_client_ip(request: Request) -> str:
     forwarded = request.headers.get("x-forwarded-for")
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        return forwarded.partition(",")[0].strip()
     client = request.client
     return client.host if client else "unknown"
 
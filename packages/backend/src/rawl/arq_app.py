@@ -5,11 +5,24 @@ Heavy emulation jobs go to emulation_worker via Redis lists.
 """
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import importlib
+
 from arq import cron, func
 from arq.connections import RedisSettings
 
 from rawl.config import settings
 
+# uvloop (via uvicorn[standard]) for the worker's loop; arq creates its loop from the
+# active policy after importing this module. Not available on Windows — keep asyncio there.
+try:
+    import uvloop
+except ImportError:
+    pass
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 
 async def startup(ctx):
     from rawl.evm.client import evm_client
@@ -18,6 +31,10 @@ async def startup(ctx):
     await redis_pool.initialize()
     await evm_client.initialize()
 
+    # Pay the SB3/torch import once at boot rather than in the first validate_model job
+    with contextlib.suppress(ImportError):
+        importlib.import_module("rawl.engine.model_normalizer")
+
 
 async def shutdown(ctx):
     from rawl.evm.client import evm_client
@@ -90,6 +90,10 @@ class Settings(BaseSettings):
     seasonal_reset_cron_hour: str = "0"
     seasonal_reset_cron_minute: str = "0"
 
+    # Model validation
+    validation_sandbox_sample_rate: float = 1.0  # fraction of submissions run in the sandbox
+    validation_sandbox_image: str = "rawl-validator:latest"  # built from Dockerfile.validator
+
     # Rate limiting
     rate_limit_enabled: bool = True
 
@@ -112,6 +116,11 @@ class Settings(BaseSettings):
     def _validate_settings(self) -> Settings:
         if self.frame_skip < 1:
             raise ValueError(f"frame_skip must be >= 1, got {self.frame_skip}")
+        if not 0.0 <= self.validation_sandbox_sample_rate <= 1.0:
+            raise ValueError(
+                "validation_sandbox_sample_rate must be within [0, 1], "
+                f"got {self.validation_sandbox_sample_rate}"
+            )
         return self
 
     @property
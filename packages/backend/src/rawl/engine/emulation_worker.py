@@ -62,9 +62,9 @@ def run_match_process(job: dict, processing_key: str, raw_payload: str) -> None:
             else:
                 logger.error("Unknown job_type, discarding", extra={"job": job})
         finally:
-            # Remove from processing list on completion (success or failure)
-            r_sync = redis.from_url(os.environ["REDIS_URL"], decode_responses=True)
-            r_sync.lrem(processing_key, 1, raw_payload)
+            # Remove from processing list on completion (success or failure).
+            # Awaited on this process's loop rather than via a throwaway sync client.
+            await redis_pool.client.lrem(processing_key, 1, raw_payload)
             await evm_client.close()
             await redis_pool.close()
 
@@ -17,6 +17,10 @@ AVC_CODEC_ID = 7
 ANNEX_B_START_CODE = b"\x00\x00\x00\x01"
 MAX_TAG_SIZE = 1 * 1024 * 1024  # 1MB safety cap
 
+# Precompiled big-endian readers — unpack_from reads in place without slicing
+_U32_BE = struct.Struct(">I")
+_U16_BE = struct.Struct(">H")
+
 
 class FLVDemuxError(Exception):
     """Raised on malformed FLV data."""
@@ -55,7 +59,7 @@ def _avcc_to_annex_b(avcc_body: bytes) -> bytes:
             raise FLVDemuxError(
                 f"AVCC truncated: need 4 bytes at offset {offset}, have {body_len - offset}"
             )
-        nalu_len = struct.unpack(">I", avcc_body[offset : offset + 4])[0]
+        nalu_len = _U32_BE.unpack_from(avcc_body, offset)[0]
         offset += 4
 
         if nalu_len == 0:
@@ -98,7 +102,7 @@ def _parse_sps_pps(avcc_body: bytes) -> bytes:
     for _ in range(num_sps):
         if offset + 2 > len(avcc_body):
             raise FLVDemuxError("SPS length truncated")
-        sps_len = struct.unpack(">H", avcc_body[offset : offset + 2])[0]
+        sps_len = _U16_BE.unpack_from(avcc_body, offset)[0]
         offset += 2
         if offset + sps_len > len(avcc_body):
             raise FLVDemuxError("SPS data truncated")
@@ -115,7 +119,7 @@ def _parse_sps_pps(avcc_body: bytes) -> bytes:
     for _ in range(num_pps):
         if offset + 2 > len(avcc_body):
             raise FLVDemuxError("PPS length truncated")
-        pps_len = struct.unpack(">H", avcc_body[offset : offset + 2])[0]
+        pps_len = _U16_BE.unpack_from(avcc_body, offset)[0]
         offset += 2
         if offset + pps_len > len(avcc_body):
             raise FLVDemuxError("PPS data truncated")
@@ -142,7 +146,7 @@ async def parse_flv_tags(reader: asyncio.StreamReader) -> AsyncIterator[VideoTag
     if header[:3] != FLV_HEADER_MAGIC:
         raise FLVDemuxError(f"Bad FLV magic: {header[:3]!r}")
 
-    data_offset = struct.unpack(">I", header[5:9])[0]
+    data_offset = _U32_BE.unpack_from(header, 5)[0]
     # Skip any extra header bytes (usually data_offset=9, so 0 extra)
     if data_offset > 9:
         await _read_exact(reader, data_offset - 9)
@@ -158,8 +162,8 @@ async def parse_flv_tags(reader: asyncio.StreamReader) -> AsyncIterator[VideoTag
             return  # Stream ended
 
         tag_type = tag_header[0]
-        data_size = struct.unpack(">I", b"\x00" + tag_header[1:4])[0]
-        ts_low = struct.unpack(">I", b"\x00" + tag_header[4:7])[0]
+        data_size = int.from_bytes(tag_header[1:4], "big")
+        ts_low = int.from_bytes(tag_header[4:7], "big")
         ts_ext = tag_header[7]
         timestamp_ms = (ts_ext << 24) | ts_low
 
@@ -176,7 +180,7 @@ async def parse_flv_tags(reader: asyncio.StreamReader) -> AsyncIterator[VideoTag
 
         # Read PreviousTagSize (4 bytes after each tag)
         prev_tag_size_bytes = await _read_exact(reader, 4)
-        prev_tag_size = struct.unpack(">I", prev_tag_size_bytes)[0]
+        prev_tag_size = _U32_BE.unpack(prev_tag_size_bytes)[0]
         expected_prev = data_size + 11
         if prev_tag_size != expected_prev:
             raise FLVDemuxError(
@@ -184,6 +184,7 @@ class H264Encoder:
             await client.expire(f"match:{self._match_id}:video", ttl)
             await client.expire(f"match:{self._match_id}:data", ttl)
             await client.expire(f"match:{self._match_id}:sps_pps", ttl)
+            await client.expire(f"match:{self._match_id}:last_keyframe_id", ttl)
         except Exception:
             pass
 
@@ -251,15 +252,23 @@ class H264Encoder:
         data = {
             b"nal": tag.nal_data,
             b"type": tag_type,
-            b"ts": str(elapsed_us).encode(),
-            b"seq": str(self._seq).encode(),
+            # timestamp_us (uint64 BE) + seq (uint32 BE): the broadcaster's
+            # WS header layout, so it is spliced into frames without parsing
+            b"hdr": struct.pack(">QI", elapsed_us, self._seq & 0xFFFFFFFF),
         }
 
         try:
-            await redis_pool.stream_publish(
+            msg_id = await redis_pool.stream_publish(
                 stream_key, data, maxlen=settings.redis_video_stream_maxlen
             )
             self.frames_published += 1
+            if tag_type != b"delta":
+                # Where a new viewer starts reading: one GET instead of a tail scan
+                await redis_pool.set(
+                    f"match:{self._match_id}:last_keyframe_id",
+                    msg_id,
+                    ex=settings.redis_stream_ttl_seconds,
+                )
         except Exception:
             logger.debug(
                 "Failed to publish NAL to Redis",
@@ -8,7 +8,7 @@ from pathlib import Path
 from stable_baselines3 import PPO
 
 from rawl.engine.model_normalizer import COMPAT_CUSTOM_OBJECTS, TRUSTED_PREFIXES
-from rawl.s3_client import download_bytes
+from rawl.s3_client import download_to_file
 
 logger = logging.getLogger(__name__)
 
@@ -42,16 +42,13 @@ async def load_fighter_model(s3_key: str, game_id: str) -> PPO:
         logger.info("Model cache hit", extra={"s3_key": s3_key})
         return _model_cache[s3_key]
 
-    # Download from S3
+    # Download from S3, streamed to a temp file for SB3 loading (no full in-memory copy)
     logger.info("Downloading model from S3", extra={"s3_key": s3_key})
-    model_bytes = await download_bytes(s3_key)
-    if model_bytes is None:
-        raise RuntimeError(f"Failed to download model: {s3_key}")
-
-    # Save to temp file for SB3 loading
     with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as tmp:
-        tmp.write(model_bytes)
         tmp_path = tmp.name
+    if await download_to_file(s3_key, tmp_path) is None:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise RuntimeError(f"Failed to download model: {s3_key}")
 
     try:
         # Defense-in-depth: compat shims for any un-normalized legacy models.
@@ -12,7 +12,7 @@ from pathlib import Path
 from stable_baselines3 import PPO
 
 from rawl.redis_client import redis_pool
-from rawl.s3_client import download_bytes, upload_bytes
+from rawl.s3_client import download_to_file, upload_file
 
 logger = logging.getLogger(__name__)
 
@@ -53,15 +53,13 @@ async def normalize_model(s3_key: str) -> PPO | None:
     tmp_out = None
 
     try:
-        model_bytes = await download_bytes(s3_key)
-        if model_bytes is None:
-            logger.error("Download failed during normalization", extra={"s3_key": s3_key})
-            return None
-
-        # Write original to temp file
+        # Stream original straight to a temp file (no full in-memory copy)
         with tempfile.NamedTemporaryFile(suffix=".zip", delete=False) as f:
-            f.write(model_bytes)
             tmp_in = f.name
+        original_size = await download_to_file(s3_key, tmp_in)
+        if original_size is None:
+            logger.error("Download failed during normalization", extra={"s3_key": s3_key})
+            return None
 
         # Load with compat shims — handles cross-version lambda and state_dict issues
         model = PPO.load(tmp_in, custom_objects=COMPAT_CUSTOM_OBJECTS, device="cpu")
@@ -71,9 +69,8 @@ async def normalize_model(s3_key: str) -> PPO | None:
             tmp_out = f.name
         model.save(tmp_out)
 
-        # Upload normalized model back to same S3 key
-        normalized_bytes = Path(tmp_out).read_bytes()
-        ok = await upload_bytes(s3_key, normalized_bytes)
+        # Upload normalized model back to same S3 key, streamed from disk
+        ok = await upload_file(s3_key, tmp_out)
         if not ok:
             logger.error("Failed to upload normalized model", extra={"s3_key": s3_key})
             return None
@@ -82,8 +79,8 @@ async def normalize_model(s3_key: str) -> PPO | None:
             "Model normalized and re-uploaded",
             extra={
                 "s3_key": s3_key,
-                "original_size": len(model_bytes),
-                "normalized_size": len(normalized_bytes),
+                "original_size": original_size,
+                "normalized_size": Path(tmp_out).stat().st_size,
             },
         )
         return model
@@ -67,10 +67,10 @@ class ReplayRecorder:
         with open(self._json_path, "w") as f:
             json.dump(self._data_entries, f, separators=(",", ":"))
 
-        # Write index file (u64 LE byte offsets)
+        # Write index file (u64 LE byte offsets) — packed into one buffer, one write
+        offsets = self._frame_offsets
         with open(self._idx_path, "wb") as f:
-            for offset in self._frame_offsets:
-                f.write(struct.pack("<Q", offset))
+            f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
 
         logger.info(
             "Replay recording closed",
@@ -7,11 +7,12 @@ match operations (create/lock/resolve/cancel/timeout), and read operations
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
 import uuid
 
 from eth_account import Account
-from web3 import AsyncWeb3, AsyncHTTPProvider
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
 
 from rawl.config import settings
 from rawl.evm.abi import CONTRACT_ABI
@@ -21,17 +22,32 @@ from rawl.monitoring.metrics import chain_tx_total
 logger = logging.getLogger(__name__)
 
 BACKOFF = [1, 2, 4]
+# Fixed tx/contract parameters, converted to wei once instead of per call
+PRIORITY_FEE_WEI = Web3.to_wei("0.001", "gwei")
+DEFAULT_MIN_BET_WEI = Web3.to_wei("0.001", "ether")
 
 
+@functools.lru_cache(maxsize=2048)
 def match_id_to_bytes(match_id: str) -> bytes:
     """Convert UUID string to 32-byte bytes for contract bytes32 param.
 
     Same logic as the old Solana pda.match_id_to_bytes():
     UUID hex (16 bytes) + 16 zero bytes = 32 bytes.
+    Cached: a match's id is re-encoded for every create/lock/resolve/read call.
     """
     return uuid.UUID(match_id).bytes.ljust(32, b"\x00")
 
 
+@functools.lru_cache(maxsize=8192)
+def checksum_address(address: str) -> str:
+    """EIP-55 checksum an address.
+
+    Cached because each call hashes the address with keccak256, and the same
+    fighter/bettor wallets are looked up repeatedly by the reconciler.
+    """
+    return Web3.to_checksum_address(address)
+
+
 class EVMClient:
     """Drop-in replacement for SolanaClient. Same public API."""
 
@@ -49,7 +65,7 @@ class EVMClient:
         self._w3 = AsyncWeb3(AsyncHTTPProvider(settings.base_rpc_url))
         self._oracle = Account.from_key(settings.oracle_private_key)
         self._contract = self._w3.eth.contract(
-            address=self._w3.to_checksum_address(settings.contract_address),
+            address=checksum_address(settings.contract_address),
             abi=CONTRACT_ABI,
         )
         self._nonce = NonceManager(self._w3, self._oracle.address)
@@ -109,6 +125,38 @@ class EVMClient:
         except Exception as e:
             return str(e)
 
+    async def _broadcast(self, fn_call) -> bytes:
+        """Build, sign, and send a transaction. Returns the tx hash without waiting."""
+        nonce = await self._nonce.get_nonce()
+        base_fee = await self._get_base_fee()
+
+        tx = await fn_call.build_transaction(
+            {
+                "from": self._oracle.address,
+                "nonce": nonce,
+                "chainId": settings.base_chain_id,
+                "maxPriorityFeePerGas": PRIORITY_FEE_WEI,
+                "maxFeePerGas": base_fee * 2 + PRIORITY_FEE_WEI,
+            }
+        )
+        tx["gas"] = await self._w3.eth.estimate_gas(tx)
+
+        signed = self._oracle.sign_transaction(tx)
+        return await self._w3.eth.send_raw_transaction(signed.raw_transaction)
+
+    async def _confirm(self, tx_hash, instruction_name: str) -> str:
+        """Wait for a receipt; raise RuntimeError on revert."""
+        receipt = await self._w3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=settings.base_confirm_timeout, poll_latency=2.0
+        )
+
+        if receipt["status"] != 1:
+            reason = await self._get_revert_reason(tx_hash, receipt)
+            raise RuntimeError(f"{instruction_name} reverted: {reason}")
+
+        chain_tx_total.labels(instruction=instruction_name, status="success").inc()
+        return tx_hash.hex()
+
     async def _send_tx(self, fn_call, instruction_name: str) -> str:
         """Build, sign, send, and confirm a contract transaction with retry."""
         await self._ensure_initialized()
@@ -116,33 +164,8 @@ class EVMClient:
         last_error = None
         for attempt in range(settings.base_max_retries):
             try:
-                nonce = await self._nonce.get_nonce()
-                base_fee = await self._get_base_fee()
-                priority_fee = self._w3.to_wei("0.001", "gwei")
-
-                tx = await fn_call.build_transaction(
-                    {
-                        "from": self._oracle.address,
-                        "nonce": nonce,
-                        "chainId": settings.base_chain_id,
-                        "maxPriorityFeePerGas": priority_fee,
-                        "maxFeePerGas": base_fee * 2 + priority_fee,
-                    }
-                )
-                tx["gas"] = await self._w3.eth.estimate_gas(tx)
-
-                signed = self._oracle.sign_transaction(tx)
-                tx_hash = await self._w3.eth.send_raw_transaction(signed.raw_transaction)
-                receipt = await self._w3.eth.wait_for_transaction_receipt(
-                    tx_hash, timeout=settings.base_confirm_timeout, poll_latency=2.0
-                )
-
-                if receipt["status"] != 1:
-                    reason = await self._get_revert_reason(tx_hash, receipt)
-                    raise RuntimeError(f"{instruction_name} reverted: {reason}")
-
-                chain_tx_total.labels(instruction=instruction_name, status="success").inc()
-                return tx_hash.hex()
+                tx_hash = await self._broadcast(fn_call)
+                return await self._confirm(tx_hash, instruction_name)
 
             except RuntimeError:
                 raise  # Don't retry contract reverts
@@ -162,6 +185,47 @@ class EVMClient:
             f"{instruction_name} failed after {settings.base_max_retries} retries: {last_error}"
         )
 
+    async def _confirm_or_resend(self, fn_call, tx_hash, instruction_name: str) -> str:
+        """Confirm a batched tx; on a non-revert failure, resend it via _send_tx."""
+        try:
+            return await self._confirm(tx_hash, instruction_name)
+        except RuntimeError:
+            raise  # Don't retry contract reverts
+        except Exception:
+            # Later txs in the batch already took the following nonces, so
+            # re-fetch from the node instead of rolling back.
+            await self._nonce.reset()
+            return await self._send_tx(fn_call, instruction_name)
+
+    async def _send_tx_batch(self, calls: list[tuple]) -> list[str | BaseException]:
+        """Send several (fn_call, instruction_name) txs, then confirm them together.
+
+        Broadcasts stay sequential so nonces are handed out in order; only the
+        receipt polling overlaps, so N txs wait ~one confirmation instead of N.
+        A call whose broadcast or confirmation fails falls back to the retrying
+        _send_tx path; reverts are final there too, so they are not resent.
+        Results are returned in input order; failures are returned, not raised.
+        """
+        await self._ensure_initialized()
+
+        pending = []
+        for fn_call, instruction_name in calls:
+            try:
+                tx_hash = await self._broadcast(fn_call)
+                pending.append(self._confirm_or_resend(fn_call, tx_hash, instruction_name))
+            except Exception as e:
+                if "nonce too low" in str(e).lower():
+                    await self._nonce.reset()
+                else:
+                    await self._nonce.rollback()
+                pending.append(self._send_tx(fn_call, instruction_name))
+
+        results = await asyncio.gather(*pending, return_exceptions=True)
+        for (_, instruction_name), result in zip(calls, results, strict=True):
+            if isinstance(result, BaseException) and not isinstance(result, RuntimeError):
+                chain_tx_total.labels(instruction=instruction_name, status="failure").inc()
+        return results
+
     # ── Match operations (return tx hash hex string) ──
 
     async def create_match_on_chain(
@@ -171,9 +235,9 @@ class EVMClient:
         mid = match_id_to_bytes(match_id)
         fn = self._contract.functions.createMatch(
             mid,
-            self._w3.to_checksum_address(fighter_a),
-            self._w3.to_checksum_address(fighter_b),
-            self._w3.to_wei("0.001", "ether"),  # default minBet
+            checksum_address(fighter_a),
+            checksum_address(fighter_b),
+            DEFAULT_MIN_BET_WEI,
             0,  # no betting window limit
         )
         return await self._send_tx(fn, "create_match")
@@ -200,6 +264,18 @@ class EVMClient:
         fn = self._contract.functions.timeoutMatch(match_id_to_bytes(match_id))
         return await self._send_tx(fn, "timeout_match")
 
+    async def timeout_matches_on_chain(self, match_ids: list[str]) -> list[str | BaseException]:
+        """Timeout several stale matches, confirming the txs concurrently.
+
+        Returns one entry per match_id: the tx hash, or the exception it failed with.
+        """
+        await self._ensure_initialized()
+        calls = [
+            (self._contract.functions.timeoutMatch(match_id_to_bytes(mid)), "timeout_match")
+            for mid in match_ids
+        ]
+        return await self._send_tx_batch(calls)
+
     # ── Read operations ──
 
     async def get_match_pool(self, match_id: str) -> dict | None:
@@ -240,7 +316,7 @@ class EVMClient:
         try:
             data = await self._contract.functions.bets(
                 match_id_to_bytes(match_id),
-                self._w3.to_checksum_address(bettor_address),
+                checksum_address(bettor_address),
             ).call()
             if data[0] == 0:  # amount == 0 means no bet
                 return None
@@ -255,7 +331,7 @@ class EVMClient:
         try:
             data = await self._contract.functions.bets(
                 match_id_to_bytes(match_id),
-                self._w3.to_checksum_address(bettor_address),
+                checksum_address(bettor_address),
             ).call()
             return data[0] > 0  # amount > 0 means bet exists
         except Exception:
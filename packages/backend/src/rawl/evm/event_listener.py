@@ -7,14 +7,17 @@ MatchCancelled, PayoutClaimed, BetRefunded events.
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import logging
-from datetime import datetime, timezone
+import uuid
 
-from web3 import AsyncWeb3, AsyncHTTPProvider
+from eth_utils import event_abi_to_log_topic
+from web3 import AsyncHTTPProvider, AsyncWeb3
 
 from rawl.config import settings
 from rawl.evm.abi import CONTRACT_ABI
+from rawl.evm.client import checksum_address
 from rawl.redis_client import redis_pool
 
 logger = logging.getLogger(__name__)
@@ -26,6 +29,25 @@ REDIS_LAST_BLOCK_KEY = "evm:last_block"
 ODDS_TTL = 300  # 5 minutes
 MAX_BLOCK_RANGE = 2000  # max blocks per eth_getLogs call (public RPC safe)
 MAX_CATCHUP_BLOCKS = 10000  # if further behind than this, skip to head
+WEI_PER_ETH = 10**18  # int/int division rounds wei → ETH correctly
+
+_HANDLED_EVENTS = (
+    "BetPlaced",
+    "MatchLocked",
+    "MatchResolved",
+    "MatchCancelled",
+    "PayoutClaimed",
+    "BetRefunded",
+    "NoWinnersRefunded",
+)
+
+# topic0 (keccak256 of the event signature) → event name, computed once at import
+# so each log is routed with a dict lookup instead of trial-decoding every event type.
+_EVENT_TOPICS: dict[bytes, str] = {
+    event_abi_to_log_topic(abi): abi["name"]
+    for abi in CONTRACT_ABI
+    if abi.get("type") == "event" and abi.get("name") in _HANDLED_EVENTS
+}
 
 
 class EventListener:
@@ -36,13 +58,23 @@ class EventListener:
         self._w3: AsyncWeb3 | None = None
         self._contract = None
         self._last_block: int = 0
+        # Bound once here rather than rebuilt for every dispatched event
+        self._handlers = {
+            "BetPlaced": self._handle_bet_placed,
+            "MatchLocked": self._handle_match_locked,
+            "MatchResolved": self._handle_match_resolved,
+            "MatchCancelled": self._handle_match_cancelled,
+            "PayoutClaimed": self._handle_payout_claimed,
+            "BetRefunded": self._handle_bet_refunded,
+            "NoWinnersRefunded": self._handle_bet_refunded,
+        }
 
     async def start(self) -> None:
         """Start the event polling loop. Runs until stop() is called."""
         self._running = True
         self._w3 = AsyncWeb3(AsyncHTTPProvider(settings.base_rpc_url))
         self._contract = self._w3.eth.contract(
-            address=self._w3.to_checksum_address(settings.contract_address),
+            address=checksum_address(settings.contract_address),
             abi=CONTRACT_ABI,
         )
 
@@ -109,7 +141,7 @@ class EventListener:
             chunk_end = min(chunk_start + MAX_BLOCK_RANGE - 1, to_block)
             logs = await self._w3.eth.get_logs(
                 {
-                    "address": self._w3.to_checksum_address(settings.contract_address),
+                    "address": self._contract.address,
                     "fromBlock": chunk_start,
                     "toBlock": chunk_end,
                 }
@@ -123,55 +155,44 @@ class EventListener:
 
     async def _handle_log(self, log) -> None:
         """Decode and route a single event log."""
+        topics = log.get("topics")
+        if not topics:
+            return
+        event_name = _EVENT_TOPICS.get(bytes(topics[0]))
+        if event_name is None:
+            return  # Unknown event — ignore
         try:
-            events = self._contract.events
-            # Try each event type
-            for event_cls in [
-                events.BetPlaced,
-                events.MatchLocked,
-                events.MatchResolved,
-                events.MatchCancelled,
-                events.PayoutClaimed,
-                events.BetRefunded,
-                events.NoWinnersRefunded,
-            ]:
-                try:
-                    decoded = event_cls().process_log(log)
-                    await self._dispatch_event(decoded["event"], decoded["args"])
-                    return
-                except Exception:
-                    continue
+            decoded = getattr(self._contract.events, event_name)().process_log(log)
         except Exception:
-            pass  # Unknown event — ignore
+            logger.warning("Failed to decode %s log", event_name)
+            return
+        await self._dispatch_event(decoded["event"], decoded["args"])
 
     async def _dispatch_event(self, event_name: str, args) -> None:
         """Route decoded event to handler."""
-        match_id_hex = args.get("matchId", b"").hex() if isinstance(args.get("matchId"), bytes) else ""
-        # Convert bytes32 match_id back to UUID format for DB lookup
-        match_id_uuid = self._bytes32_to_uuid(args.get("matchId", b""))
+        handler = self._handlers.get(event_name)
+        if not handler:
+            return
 
-        handler = {
-            "BetPlaced": self._handle_bet_placed,
-            "MatchLocked": self._handle_match_locked,
-            "MatchResolved": self._handle_match_resolved,
-            "MatchCancelled": self._handle_match_cancelled,
-            "PayoutClaimed": self._handle_payout_claimed,
-            "BetRefunded": self._handle_bet_refunded,
-            "NoWinnersRefunded": self._handle_bet_refunded,
-        }.get(event_name)
+        raw_match_id = args.get("matchId", b"")
+        # Convert bytes32 match_id back to UUID format for DB lookup
+        match_id_uuid = self._bytes32_to_uuid(raw_match_id)
 
-        if handler:
-            await handler(args, match_id_uuid)
-            logger.info("Processed event %s for match %s", event_name, match_id_uuid or match_id_hex)
+        await handler(args, match_id_uuid)
+        match_id_hex = raw_match_id.hex() if isinstance(raw_match_id, bytes) else ""
+        logger.info("Processed event %s for match %s", event_name, match_id_uuid or match_id_hex)
 
     @staticmethod
+    @functools.lru_cache(maxsize=2048)
     def _bytes32_to_uuid(b: bytes) -> str | None:
-        """Convert bytes32 back to UUID string (first 16 bytes)."""
+        """Convert bytes32 back to UUID string (first 16 bytes).
+
+        Cached: every bet/claim/refund log for a match repeats the same matchId.
+        """
         if not b or len(b) < 16:
             return None
-        import uuid as _uuid
         try:
-            return str(_uuid.UUID(bytes=b[:16]))
+            return str(uuid.UUID(bytes=b[:16]))
         except Exception:
             return None
 
@@ -180,7 +201,7 @@ class EventListener:
         if not match_id_uuid:
             return
 
-        from sqlalchemy import select
+        from sqlalchemy import func, select, update
 
         from rawl.db.models.bet import Bet
         from rawl.db.models.match import Match
@@ -188,8 +209,7 @@ class EventListener:
 
         bettor = args["bettor"]
         side = "a" if args["side"] == 0 else "b"
-        amount_wei = args["amount"]
-        amount_eth = amount_wei / 1e18
+        amount_eth = args["amount"] / WEI_PER_ETH
 
         async with worker_session_factory() as db:
             # Check for existing bet record
@@ -215,14 +235,13 @@ class EventListener:
                 )
                 db.add(bet)
 
-            # Update match side totals
-            match_result = await db.execute(select(Match).where(Match.id == match_id_uuid))
-            match = match_result.scalar_one_or_none()
-            if match:
-                if side == "a":
-                    match.side_a_total = (match.side_a_total or 0) + amount_eth
-                else:
-                    match.side_b_total = (match.side_b_total or 0) + amount_eth
+            # Update match side totals — single UPDATE, incremented in SQL
+            total_col = Match.side_a_total if side == "a" else Match.side_b_total
+            await db.execute(
+                update(Match)
+                .where(Match.id == match_id_uuid)
+                .values({total_col: func.coalesce(total_col, 0) + amount_eth})
+            )
 
             await db.commit()
 
@@ -233,63 +252,65 @@ class EventListener:
         if not match_id_uuid:
             return
 
-        from sqlalchemy import select
+        from sqlalchemy import func, update
 
         from rawl.db.models.match import Match
         from rawl.db.session import worker_session_factory
 
+        # Single UPDATE instead of SELECT + mutate; a missing row simply matches nothing
         async with worker_session_factory() as db:
-            result = await db.execute(select(Match).where(Match.id == match_id_uuid))
-            match = result.scalar_one_or_none()
-            if match:
-                match.status = "locked"
-                match.locked_at = datetime.now(timezone.utc)
-                await db.commit()
+            await db.execute(
+                update(Match)
+                .where(Match.id == match_id_uuid)
+                .values(status="locked", locked_at=func.now())  # DB clock is authoritative
+            )
+            await db.commit()
 
     async def _handle_match_resolved(self, args, match_id_uuid: str | None) -> None:
         if not match_id_uuid:
             return
 
-        from sqlalchemy import select
+        from sqlalchemy import func, update
 
         from rawl.db.models.match import Match
         from rawl.db.session import worker_session_factory
 
-        winner_side = args["winner"]  # 0=SideA, 1=SideB
-
         async with worker_session_factory() as db:
-            result = await db.execute(select(Match).where(Match.id == match_id_uuid))
-            match = result.scalar_one_or_none()
-            if match:
-                match.status = "resolved"
-                match.resolved_at = datetime.now(timezone.utc)
-                # Update side totals from event data
-                match.side_a_total = args.get("sideATotal", 0) / 1e18
-                match.side_b_total = args.get("sideBTotal", 0) / 1e18
-                await db.commit()
+            await db.execute(
+                update(Match)
+                .where(Match.id == match_id_uuid)
+                .values(
+                    status="resolved",
+                    resolved_at=func.now(),
+                    # Side totals from event data (wei ints, converted once)
+                    side_a_total=args.get("sideATotal", 0) / WEI_PER_ETH,
+                    side_b_total=args.get("sideBTotal", 0) / WEI_PER_ETH,
+                )
+            )
+            await db.commit()
 
     async def _handle_match_cancelled(self, args, match_id_uuid: str | None) -> None:
         if not match_id_uuid:
             return
 
-        from sqlalchemy import select
+        from sqlalchemy import func, update
 
         from rawl.db.models.match import Match
         from rawl.db.session import worker_session_factory
 
         async with worker_session_factory() as db:
-            result = await db.execute(select(Match).where(Match.id == match_id_uuid))
-            match = result.scalar_one_or_none()
-            if match:
-                match.status = "cancelled"
-                match.cancelled_at = datetime.now(timezone.utc)
-                await db.commit()
+            await db.execute(
+                update(Match)
+                .where(Match.id == match_id_uuid)
+                .values(status="cancelled", cancelled_at=func.now())
+            )
+            await db.commit()
 
     async def _handle_payout_claimed(self, args, match_id_uuid: str | None) -> None:
         if not match_id_uuid:
             return
 
-        from sqlalchemy import select
+        from sqlalchemy import func, update
 
         from rawl.db.models.bet import Bet
         from rawl.db.session import worker_session_factory
@@ -297,23 +318,18 @@ class EventListener:
         bettor = args["bettor"]
 
         async with worker_session_factory() as db:
-            result = await db.execute(
-                select(Bet).where(
-                    Bet.match_id == match_id_uuid,
-                    Bet.wallet_address == bettor.lower(),
-                )
+            await db.execute(
+                update(Bet)
+                .where(Bet.match_id == match_id_uuid, Bet.wallet_address == bettor.lower())
+                .values(status="claimed", claimed_at=func.now())
             )
-            bet = result.scalar_one_or_none()
-            if bet:
-                bet.status = "claimed"
-                bet.claimed_at = datetime.now(timezone.utc)
-                await db.commit()
+            await db.commit()
 
     async def _handle_bet_refunded(self, args, match_id_uuid: str | None) -> None:
         if not match_id_uuid:
             return
 
-        from sqlalchemy import select
+        from sqlalchemy import update
 
         from rawl.db.models.bet import Bet
         from rawl.db.session import worker_session_factory
@@ -321,16 +337,12 @@ class EventListener:
         bettor = args["bettor"]
 
         async with worker_session_factory() as db:
-            result = await db.execute(
-                select(Bet).where(
-                    Bet.match_id == match_id_uuid,
-                    Bet.wallet_address == bettor.lower(),
-                )
+            await db.execute(
+                update(Bet)
+                .where(Bet.match_id == match_id_uuid, Bet.wallet_address == bettor.lower())
+                .values(status="refunded")
             )
-            bet = result.scalar_one_or_none()
-            if bet:
-                bet.status = "refunded"
-                await db.commit()
+            await db.commit()
 
     async def _publish_odds(self, match_id_uuid: str) -> None:
         """Publish current odds to Redis for real-time display."""
@@ -344,13 +356,15 @@ class EventListener:
                 result = await db.execute(select(Match).where(Match.id == match_id_uuid))
                 match = result.scalar_one_or_none()
                 if match:
-                    total = (match.side_a_total or 0) + (match.side_b_total or 0)
+                    side_a = match.side_a_total or 0
+                    side_b = match.side_b_total or 0
+                    total = side_a + side_b
                     odds = {
-                        "side_a_total": match.side_a_total or 0,
-                        "side_b_total": match.side_b_total or 0,
+                        "side_a_total": side_a,
+                        "side_b_total": side_b,
                         "total": total,
-                        "odds_a": round(total / match.side_a_total, 2) if match.side_a_total else 0,
-                        "odds_b": round(total / match.side_b_total, 2) if match.side_b_total else 0,
+                        "odds_a": round(total / side_a, 2) if side_a else 0,
+                        "odds_b": round(total / side_b, 2) if side_b else 0,
                     }
                     match_id_hex = match_id_uuid.replace("-", "")[:32]
                     await redis_pool.set(
@@ -6,14 +6,15 @@ from rawl.config import settings
 
 
 class RedisPool:
-    def __init__(self) -> None:
+    def __init__(self, max_connections: int = 20) -> None:
         self._pool: aioredis.Redis | None = None
+        self._max_connections = max_connections
 
     async def initialize(self) -> None:
         self._pool = aioredis.from_url(
             settings.redis_url,
             decode_responses=False,
-            max_connections=20,
+            max_connections=self._max_connections,
         )
 
     @property
@@ -23,10 +24,19 @@ class RedisPool:
             self._pool = aioredis.from_url(
                 settings.redis_url,
                 decode_responses=False,
-                max_connections=20,
+                max_connections=self._max_connections,
             )
         return self._pool
 
+    def dedicated(self) -> RedisPool:
+        """A separate single-connection pool for long blocking reads.
+
+        A long XREAD BLOCK holds its connection for the whole wait; running
+        those on the shared pool would starve ordinary commands. The caller
+        must close() it when done.
+        """
+        return RedisPool(max_connections=1)
+
     async def close(self) -> None:
         if self._pool:
             await self._pool.aclose()
@@ -59,9 +69,11 @@ class RedisPool:
         """Read from a Redis stream with BLOCK."""
         return await self.client.xread({stream: last_id}, count=count, block=block)
 
-    async def stream_revrange(self, stream: str, count: int = 10) -> list:
-        """Read entries from a Redis stream in reverse order (newest first)."""
-        return await self.client.xrevrange(stream, count=count)
+    async def stream_range(
+        self, stream: str, start: str = "-", end: str = "+", count: int | None = None
+    ) -> list:
+        """Read entries from a Redis stream in order, both bounds inclusive."""
+        return await self.client.xrange(stream, min=start, max=end, count=count)
 
     async def set_with_expiry(self, key: str, value: str, ex: int) -> None:
         """Set a key with expiry in seconds."""
@@ -70,6 +82,9 @@ class RedisPool:
     async def get(self, key: str) -> bytes | None:
         return await self.client.get(key)
 
+    async def mget(self, *keys: str) -> list[bytes | None]:
+        return await self.client.mget(keys)
+
     async def incr(self, key: str) -> int:
         return await self.client.incr(key)
 
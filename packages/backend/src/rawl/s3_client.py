@@ -57,6 +57,36 @@ async def upload_bytes(key: str, data: bytes, content_type: str = "application/o
     return False
 
 
+async def upload_file(key: str, path: str, content_type: str = "application/octet-stream") -> bool:
+    """Upload a local file to S3 with the same retry policy as upload_bytes.
+
+    Streams from disk via the managed transfer (multipart for large files),
+    so the file is never read into memory whole.
+    """
+    for attempt, delay in enumerate(RETRY_DELAYS):
+        try:
+            async with await _get_client() as client:
+                await client.upload_file(
+                    path,
+                    settings.s3_bucket,
+                    key,
+                    ExtraArgs={"ContentType": content_type},
+                )
+            logger.info("S3 upload succeeded", extra={"key": key, "attempt": attempt + 1})
+            return True
+        except Exception:
+            logger.warning(
+                "S3 upload failed, retrying",
+                extra={"key": key, "attempt": attempt + 1, "retry_delay": delay},
+                exc_info=True,
+            )
+            if attempt < len(RETRY_DELAYS) - 1:
+                await asyncio.sleep(delay)
+
+    logger.error("S3 upload exhausted all retries", extra={"key": key})
+    return False
+
+
 async def download_bytes(key: str) -> bytes | None:
     """Download an object from S3. Returns None if not found."""
     try:
@@ -68,6 +98,25 @@ async def download_bytes(key: str) -> bytes | None:
         return None
 
 
+async def download_to_file(key: str, path: str, chunk_size: int = 1 << 20) -> int | None:
+    """Stream an S3 object to a local file in chunks. Returns bytes written, None on failure.
+
+    Only one chunk is resident at a time, unlike download_bytes.
+    """
+    try:
+        written = 0
+        async with await _get_client() as client:
+            response = await client.get_object(Bucket=settings.s3_bucket, Key=key)
+            with open(path, "wb") as f:
+                async for chunk in response["Body"].iter_chunks(chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+        return written
+    except Exception:
+        logger.error("S3 streaming download failed", extra={"key": key}, exc_info=True)
+        return None
+
+
 async def download_byte_range(key: str, start: int, end: int) -> bytes | None:
     """Download a byte range [start, end) from S3. Returns None on failure."""
     if start < 0 or end <= start:
@@ -183,10 +183,14 @@ async def _timeout_stale_matches_async():
         if not stale_matches:
             return
 
-        for match in stale_matches:
-            match_id = str(match.id)
+        # Broadcast all timeouts back-to-back and confirm them together
+        match_ids = [str(match.id) for match in stale_matches]
+        results = await evm_client.timeout_matches_on_chain(match_ids)
+
+        for match, match_id, sig in zip(stale_matches, match_ids, results, strict=True):
             try:
-                sig = await evm_client.timeout_match_on_chain(match_id)
+                if isinstance(sig, BaseException):
+                    raise sig
                 logger.info(
                     "Match timed out on-chain",
                     extra={"match_id": match_id, "tx_hash": sig},
@@ -9,6 +9,7 @@ from __future__ import annotations
 import logging
 import random
 import tempfile
+from collections import OrderedDict
 from pathlib import Path
 
 from stable_baselines3 import PPO
@@ -32,15 +33,19 @@ class SelfPlayCallback(BaseCallback):
         max_pool_size: int = 20,
         recent_ratio: float = 0.7,
         checkpoint_dir: str | None = None,
+        max_loaded_opponents: int = 8,
     ):
         super().__init__()
         self.checkpoint_interval = checkpoint_interval
         self.max_pool_size = max_pool_size
         self.recent_ratio = recent_ratio
+        self.max_loaded_opponents = max_loaded_opponents
         self._checkpoint_dir = Path(checkpoint_dir or tempfile.mkdtemp(prefix="rawl_selfplay_"))
         self._pool: list[Path] = []
         self._last_checkpoint = 0
         self._current_opponent: PPO | None = None
+        # LRU of loaded checkpoints — avoids re-deserializing hot opponents
+        self._loaded: OrderedDict[Path, PPO] = OrderedDict()
 
     def _on_step(self) -> bool:
         current = self.num_timesteps
@@ -57,10 +62,12 @@ class SelfPlayCallback(BaseCallback):
 
         # Trim pool if over max size (keep most recent + spread of historical)
         if len(self._pool) > self.max_pool_size:
-            # Keep first, last N-1, and remove middle entries
-            keep = [self._pool[0]] + self._pool[-(self.max_pool_size - 1):]
-            removed = [p for p in self._pool if p not in keep]
+            # Keep first, last N-1, and remove middle entries (by position, no scans)
+            tail_start = len(self._pool) - (self.max_pool_size - 1)
+            keep = [self._pool[0]] + self._pool[tail_start:]
+            removed = self._pool[1:tail_start]
             for p in removed:
+                self._loaded.pop(p, None)
                 p.unlink(missing_ok=True)
             self._pool = keep
 
@@ -81,23 +88,38 @@ class SelfPlayCallback(BaseCallback):
         pool_size = len(self._pool)
         recent_cutoff = max(1, int(pool_size * 0.7))
 
+        # Index arithmetic rather than random.choice on a slice copy of the pool
         if random.random() < self.recent_ratio and pool_size > recent_cutoff:
             # Sample from recent checkpoints
-            path = random.choice(self._pool[recent_cutoff:])
+            path = self._pool[random.randrange(recent_cutoff, pool_size)]
         else:
             # Sample from historical checkpoints
-            path = random.choice(self._pool[:recent_cutoff])
+            path = self._pool[random.randrange(recent_cutoff)]
 
         try:
-            opponent = PPO.load(str(path))
+            opponent = self._load_opponent(path)
             logger.info("Sampled opponent", extra={"checkpoint": path.name})
             return opponent
         except Exception:
             logger.exception("Failed to load opponent checkpoint")
             return None
 
+    def _load_opponent(self, path: Path) -> PPO:
+        """Load a checkpoint, reusing an already-loaded model when cached."""
+        opponent = self._loaded.get(path)
+        if opponent is not None:
+            self._loaded.move_to_end(path)
+            return opponent
+
+        opponent = PPO.load(str(path))
+        self._loaded[path] = opponent
+        if len(self._loaded) > self.max_loaded_opponents:
+            self._loaded.popitem(last=False)
+        return opponent
+
     def cleanup(self) -> None:
         """Remove all checkpoint files."""
         for path in self._pool:
             path.unlink(missing_ok=True)
         self._pool.clear()
+        self._loaded.clear()
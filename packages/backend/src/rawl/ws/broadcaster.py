@@ -6,12 +6,19 @@ import logging
 import struct
 import uuid as _uuid
 from collections import defaultdict
+from typing import TYPE_CHECKING
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from rawl.config import settings
 from rawl.monitoring.metrics import ws_connections
 from rawl.redis_client import redis_pool
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from rawl.redis_client import RedisPool
+
 logger = logging.getLogger(__name__)
 
 ws_router = APIRouter()
@@ -20,11 +27,12 @@ ws_router = APIRouter()
 VIDEO_CONNECTIONS_PER_IP = 2
 DATA_CONNECTIONS_PER_IP = 5
 
-# Track connections per IP per channel
+# Track connections per match and per IP per channel. Entries are removed
+# when they drop to zero so the maps stay bounded by live connections.
 _video_connections: dict[str, set[WebSocket]] = defaultdict(set)
 _data_connections: dict[str, set[WebSocket]] = defaultdict(set)
-_ip_video_count: dict[str, int] = defaultdict(int)
-_ip_data_count: dict[str, int] = defaultdict(int)
+_ip_video_count: dict[str, int] = {}
+_ip_data_count: dict[str, int] = {}
 
 # Binary WS protocol: header = type(1) + timestamp_us(8 BE) + seq(4 BE) = 13 bytes
 TYPE_SEQ_HEADER = 0x01
@@ -32,23 +40,49 @@ TYPE_KEYFRAME = 0x02
 TYPE_DELTA = 0x03
 TYPE_EOS = 0x04
 HEADER_SIZE = 13
+_HEADER = struct.Struct(">BQI")
+# Batch message: type(1) + repeated [length(4 BE) + frame] for backlogged frames
+TYPE_BATCH = 0x05
+_BATCH_MAX_FRAMES = 8
+_BATCH_LENGTH = struct.Struct(">I")
+
+# NAL types a lagging reader may jump forward to without breaking decode
+_SKIP_ANCHOR_TYPES = frozenset((b"key", b"seq", b"eos"))
 
 # Backpressure: disconnect if > 80% frames dropped in this window
 _BACKPRESSURE_WINDOW = 60
 _BACKPRESSURE_DROP_THRESHOLD = 0.80
 
+# Data channel JSON: compact separators, encoder built once
+_DATA_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Fan-out: messages buffered per data viewer before the pump starts dropping
+# for it (video viewers buffer one GOP, see video_channel)
+_SUBSCRIBER_QUEUE_SIZE = 64
+# Cap on frames kept since the last keyframe for priming late joiners
+_GOP_CACHE_LIMIT = 300
+# Pump XREAD BLOCK: Redis answers as soon as an entry lands, so a long block
+# only bounds how often an idle stream wakes the pump
+_PUMP_BLOCK_MS = 5000
+
 
 def _get_client_ip(websocket: WebSocket) -> str:
     """Extract client IP from WebSocket connection."""
     forwarded = websocket.headers.get("x-forwarded-for")
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        return forwarded.partition(",")[0].strip()
     client = websocket.client
     return client.host if client else "unknown"
 
 
-async def _watch_disconnect(websocket: WebSocket, event: asyncio.Event) -> None:
-    """Wait for a client disconnect and signal the event."""
+async def _watch_disconnect(websocket: WebSocket, sub: _Subscriber) -> None:
+    """Wait for a client disconnect and wake the subscriber's send loop.
+
+    Send errors alone are not enough: a viewer parked in queue.get() on an
+    idle or ended match never sends again, so without this its closed socket
+    would keep the pump (and its Redis reads) alive indefinitely. The task
+    sits on one pending receive and costs nothing between messages.
+    """
     try:
         while True:
             msg = await websocket.receive()
@@ -56,17 +90,62 @@ async def _watch_disconnect(websocket: WebSocket, event: asyncio.Event) -> None:
                 break
     except Exception:
         pass
-    event.set()
+    sub.close()
+
+
+def _try_reserve(counts: dict[str, int], client_ip: str, limit: int) -> bool:
+    """Claim a connection slot for an IP; False if it is already at the limit.
+
+    Check and increment happen with no await in between, so concurrent
+    handshakes from one IP cannot both pass the check.
+    """
+    current = counts.get(client_ip, 0)
+    if current >= limit:
+        return False
+    counts[client_ip] = current + 1
+    return True
+
+
+def _release(counts: dict[str, int], client_ip: str) -> None:
+    """Return a slot claimed by _try_reserve, dropping the IP at zero."""
+    remaining = counts.get(client_ip, 0) - 1
+    if remaining > 0:
+        counts[client_ip] = remaining
+    else:
+        counts.pop(client_ip, None)
+
+
+def _untrack(connections: dict[str, set[WebSocket]], match_id: str, websocket: WebSocket) -> None:
+    """Remove a socket from its match's set, dropping the match when empty."""
+    conns = connections.get(match_id)
+    if conns is not None:
+        conns.discard(websocket)
+        if not conns:
+            del connections[match_id]
 
 
 def _build_ws_frame(
     frame_type: int, timestamp_us: int, seq: int, nal_data: bytes = b""
 ) -> bytes:
     """Build binary WebSocket frame: type(1) + timestamp(8 BE) + seq(4 BE) + NAL data."""
-    header = struct.pack(">BQI", frame_type, timestamp_us, seq)
+    # Built once per stream entry and shared by every viewer. ASGI websocket.send
+    # takes bytes, so packing into a reused bytearray would only add a copy.
+    header = _HEADER.pack(frame_type, timestamp_us, seq)
     return header + nal_data
 
 
+_EOS_FRAME = _build_ws_frame(TYPE_EOS, 0, 0)
+
+
+def _build_batch(frames: list[bytes]) -> bytes:
+    """Coalesce several frames into one binary message: type(1) + [len(4 BE) + frame]..."""
+    parts = [bytes((TYPE_BATCH,))]
+    for frame in frames:
+        parts.append(_BATCH_LENGTH.pack(len(frame)))
+        parts.append(frame)
+    return b"".join(parts)
+
+
 def _nal_type_to_ws_type(nal_type: bytes) -> int:
     """Map Redis NAL type tag to WS protocol type byte."""
     if nal_type == b"seq":
@@ -80,20 +159,279 @@ def _nal_type_to_ws_type(nal_type: bytes) -> int:
     return TYPE_DELTA
 
 
-async def _find_latest_keyframe_id(stream_key: str) -> str | None:
-    """Find the stream ID of the most recent keyframe using XREVRANGE.
-
-    Returns the stream ID to start reading from, or None if no keyframe found.
+class _Subscriber:
+    """One viewer attached to a pump: a bounded frame queue plus drop stats."""
+
+    __slots__ = ("queue", "sent", "dropped", "resync", "closed")
+
+    def __init__(self, queue_size: int = _SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.sent = 0
+        self.dropped = 0
+        # Video: a delta was dropped, so skip deltas until the next keyframe
+        self.resync = False
+        self.closed = False
+
+    def offer(self, item) -> None:
+        """Enqueue without blocking the pump; a full queue drops the item."""
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    def offer_video(self, frame: bytes, anchor: bool) -> None:
+        """Enqueue a video frame so what the viewer gets stays decodable.
+
+        A keyframe (or sequence header) reaching a full queue supersedes the
+        stale backlog, which is discarded. Once a delta has been dropped the
+        decoder cannot use later deltas either, so they are skipped until the
+        next keyframe instead of being sent only to be rejected.
+        """
+        if anchor:
+            if self.queue.full() and not self.closed:
+                self.dropped += self.queue.qsize()
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+            self.resync = False
+            self.offer(frame)
+        elif self.resync or self.queue.full():
+            self.resync = True
+            self.dropped += 1
+        else:
+            self.queue.put_nowait(frame)
+
+    def push(self, item) -> None:
+        """Enqueue a control item (EOS, disconnect), evicting the oldest frame if full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(item)
+
+    def close(self) -> None:
+        """Wake the send loop for a disconnected viewer; the wake-up is never flushed."""
+        self.closed = True
+        self.push(None)
+
+
+class _Pump:
+    """Single Redis stream reader for one match channel, fanned out to subscribers.
+
+    Every viewer of a match used to run its own XREAD loop, so Redis served
+    the same entries N times per frame. The pump reads once and hands each
+    entry to every subscriber queue. It is created on first attach and
+    cancelled when the last subscriber detaches.
     """
+
+    __slots__ = ("match_id", "stream_key", "subscribers", "task", "header", "gop")
+
+    def __init__(self, match_id: str, stream_key: str) -> None:
+        self.match_id = match_id
+        self.stream_key = stream_key
+        self.subscribers: set[_Subscriber] = set()
+        self.task: asyncio.Task | None = None
+        # Video only: SPS+PPS frame and frames since the last keyframe,
+        # replayed to viewers who join an already-running pump
+        self.header: bytes | None = None
+        self.gop: list[bytes] = []
+
+    def publish(self, item) -> None:
+        for sub in self.subscribers:
+            sub.offer(item)
+
+    def publish_video(self, frame: bytes, anchor: bool) -> None:
+        for sub in self.subscribers:
+            sub.offer_video(frame, anchor)
+
+    def publish_final(self, item) -> None:
+        for sub in self.subscribers:
+            sub.push(item)
+
+    def _forget(self, _task: asyncio.Task) -> None:
+        if _pumps.get(self.stream_key) is self:
+            del _pumps[self.stream_key]
+
+
+_pumps: dict[str, _Pump] = {}
+
+
+def _attach(
+    match_id: str,
+    stream_key: str,
+    run: Callable[[_Pump], Awaitable[None]],
+    queue_size: int = _SUBSCRIBER_QUEUE_SIZE,
+) -> tuple[_Pump, _Subscriber]:
+    """Subscribe to the pump for a stream, starting it if none is running."""
+    pump = _pumps.get(stream_key)
+    if pump is None:
+        pump = _Pump(match_id, stream_key)
+        _pumps[stream_key] = pump
+        pump.task = asyncio.create_task(run(pump))
+        pump.task.add_done_callback(pump._forget)
+    sub = _Subscriber(queue_size)
+    pump.subscribers.add(sub)
+    return pump, sub
+
+
+def _detach(pump: _Pump, sub: _Subscriber) -> None:
+    """Unsubscribe; the last subscriber out stops the pump."""
+    pump.subscribers.discard(sub)
+    if not pump.subscribers:
+        pump._forget(pump.task)
+        if pump.task is not None:
+            pump.task.cancel()
+
+
+async def _run_video_pump(pump: _Pump) -> None:
+    """Read the video stream once per match and fan built frames out to viewers."""
+    stream_key = pump.stream_key
+    sps_pps_key = f"match:{pump.match_id}:sps_pps"
+    keyframe_key = f"match:{pump.match_id}:last_keyframe_id"
+
+    # Start the first viewers on the latest keyframe so they can decode at once
+    last_id = "$"
+    backlog: list = []
     try:
-        entries = await redis_pool.stream_revrange(stream_key, count=60)
-        for msg_id, data in entries:
-            nal_type = data.get(b"type", b"")
-            if nal_type in (b"key", b"seq"):
-                return msg_id.decode() if isinstance(msg_id, bytes) else msg_id
+        # Cached SPS+PPS and the producer-maintained keyframe ID in one round trip
+        sps_pps, keyframe_id = await redis_pool.mget(sps_pps_key, keyframe_key)
+
+        # Send cached SPS+PPS if available
+        if sps_pps:
+            pump.header = _build_ws_frame(TYPE_SEQ_HEADER, 0, 0, sps_pps)
+            pump.publish(pump.header)
+
+        if keyframe_id:
+            # XRANGE is inclusive, so the GOP is read starting at the keyframe itself
+            backlog = await redis_pool.stream_range(
+                stream_key, start=keyframe_id.decode(), count=_GOP_CACHE_LIMIT
+            )
+            if backlog:
+                last_id = backlog[-1][0]
     except Exception as e:
-        logger.debug("Failed to find latest keyframe", extra={"error": str(e)})
-    return None
+        logger.debug("Late joiner setup failed, starting from live", extra={"error": str(e)})
+
+    try:
+        if _publish_video_entries(pump, backlog):
+            return
+
+        reader = redis_pool.dedicated()
+        try:
+            await _pump_video_stream(pump, reader, last_id)
+        finally:
+            await reader.close()
+    except Exception:
+        logger.exception("Video pump failed", extra={"match_id": pump.match_id})
+        # End every viewer's stream instead of leaving their sockets silent
+        pump.publish_final(_EOS_FRAME)
+
+
+async def _pump_video_stream(pump: _Pump, reader: RedisPool, last_id: str | bytes) -> None:
+    """Live part of the video pump: long-blocking XREAD on a dedicated connection."""
+    stream_key = pump.stream_key
+    while True:
+        try:
+            messages = await reader.stream_read(
+                stream_key, last_id=last_id, count=32, block=_PUMP_BLOCK_MS
+            )
+        except Exception as e:
+            logger.warning(
+                "Redis stream read error (video)",
+                extra={"match_id": pump.match_id, "error": str(e)},
+            )
+            await asyncio.sleep(0.1)
+            continue
+
+        if not messages:
+            continue
+
+        # Collect all entries from this batch
+        entries_to_send: list[tuple[str, dict]] = []
+        for _stream_name, entries in messages:
+            for msg_id, data in entries:
+                last_id = msg_id
+                entries_to_send.append((msg_id, data))
+
+        if not entries_to_send:
+            continue
+
+        # Keyframe-aware skip: when behind, keep latest keyframe + all deltas after it
+        if len(entries_to_send) > 3:
+            for i in range(len(entries_to_send) - 1, 0, -1):
+                if entries_to_send[i][1].get(b"type") in _SKIP_ANCHOR_TYPES:
+                    entries_to_send = entries_to_send[i:]
+                    break
+
+        if _publish_video_entries(pump, entries_to_send):
+            return
+
+
+def _publish_video_entries(pump: _Pump, entries: list) -> bool:
+    """Build a frame per video stream entry and fan it out; True once EOS is seen."""
+    for _msg_id, data in entries:
+        nal_type = data.get(b"type", b"delta")
+
+        # EOS sentinel: must reach every viewer, so it is never dropped
+        if nal_type == b"eos":
+            pump.publish_final(_EOS_FRAME)
+            return True
+
+        nal_data = data.get(b"nal", b"")
+        if not nal_data:
+            continue
+
+        ws_type = _nal_type_to_ws_type(nal_type)
+        ts_seq = data.get(b"hdr")
+        if ts_seq is not None and len(ts_seq) == HEADER_SIZE - 1:
+            # Producer packed timestamp + seq in wire order: splice as-is
+            frame = b"".join((bytes((ws_type,)), ts_seq, nal_data))
+        else:
+            # Entries from encoders that still write decimal ts/seq
+            ts = int(data.get(b"ts", b"0"))
+            seq = int(data.get(b"seq", b"0"))
+            frame = _build_ws_frame(ws_type, ts, seq, nal_data)
+
+        if nal_type == b"seq":
+            pump.header = frame
+            pump.gop.clear()
+        elif nal_type == b"key":
+            pump.gop.clear()
+            pump.gop.append(frame)
+        elif pump.gop and len(pump.gop) < _GOP_CACHE_LIMIT:
+            pump.gop.append(frame)
+
+        pump.publish_video(frame, anchor=nal_type != b"delta")
+    return False
+
+
+async def _run_data_pump(pump: _Pump) -> None:
+    """Read the data stream once per match and fan JSON text out to viewers."""
+    last_id = "$"
+    try:
+        reader = redis_pool.dedicated()
+        try:
+            while True:
+                try:
+                    messages = await reader.stream_read(
+                        pump.stream_key, last_id=last_id, count=10, block=_PUMP_BLOCK_MS
+                    )
+                except Exception as e:
+                    logger.warning(
+                        "Redis stream read error (data)",
+                        extra={"match_id": pump.match_id, "error": str(e)},
+                    )
+                    await asyncio.sleep(0.1)
+                    continue
+
+                for _stream_name, entries in messages or ():
+                    for msg_id, data in entries:
+                        last_id = msg_id
+                        # Build and encode the 16-field data message once for every viewer
+                        msg = _build_data_message(pump.match_id, data)
+                        pump.publish(_DATA_ENCODER.encode(msg))
+        finally:
+            await reader.close()
+    except Exception:
+        logger.exception("Data pump failed", extra={"match_id": pump.match_id})
+        # Wake every viewer's send loop so their connections end
+        pump.publish_final(None)
 
 
 @ws_router.websocket("/match/{match_id}/video")
@@ -106,6 +444,9 @@ async def video_channel(websocket: WebSocket, match_id: str) -> None:
       Bytes 9-12: sequence number (uint32 BE)
       Bytes 13+: H.264 NAL unit data (Annex B format)
 
+    A viewer that falls behind gets its backlog as one 0x05 batch message:
+    type byte, then each frame above prefixed with its length (uint32 BE).
+
     Late joiners receive SPS+PPS + latest keyframe on connect.
     Connection limit: 2 concurrent per IP.
     """
@@ -117,13 +458,16 @@ async def video_channel(websocket: WebSocket, match_id: str) -> None:
 
     client_ip = _get_client_ip(websocket)
 
-    if _ip_video_count[client_ip] >= VIDEO_CONNECTIONS_PER_IP:
+    if not _try_reserve(_ip_video_count, client_ip, VIDEO_CONNECTIONS_PER_IP):
         await websocket.close(code=4029, reason="Too many video connections")
         return
 
-    await websocket.accept()
+    try:
+        await websocket.accept()
+    except Exception:
+        _release(_ip_video_count, client_ip)
+        raise
     _video_connections[match_id].add(websocket)
-    _ip_video_count[client_ip] += 1
     ws_connections.labels(channel="video").inc()
 
     logger.info(
@@ -131,135 +475,85 @@ async def video_channel(websocket: WebSocket, match_id: str) -> None:
         extra={"match_id": match_id, "client_ip": client_ip},
     )
 
-    disconnected = asyncio.Event()
-    watcher = asyncio.create_task(_watch_disconnect(websocket, disconnected))
-
-    stream_key = f"match:{match_id}:video"
-    sps_pps_key = f"match:{match_id}:sps_pps"
+    # At most SPS+PPS plus one GOP buffered per viewer; a newer keyframe supersedes it
+    pump, sub = _attach(
+        match_id,
+        f"match:{match_id}:video",
+        _run_video_pump,
+        queue_size=settings.h264_keyframe_interval + 1,
+    )
+    # Late joiner: SPS+PPS and the current GOP, snapshotted atomically with attach
+    backlog = [pump.header, *pump.gop] if pump.header else list(pump.gop)
+    if not pump.gop:
+        # No keyframe seen yet: deltas are undecodable until the next one arrives
+        sub.resync = True
+    watcher = asyncio.create_task(_watch_disconnect(websocket, sub))
 
-    # Late joiner: send SPS+PPS first, then seek to latest keyframe
-    last_id = "$"
     try:
-        # Send cached SPS+PPS if available
-        sps_pps = await redis_pool.get(sps_pps_key)
-        if sps_pps:
-            frame = _build_ws_frame(TYPE_SEQ_HEADER, 0, 0, sps_pps)
+        for frame in backlog:
             await websocket.send_bytes(frame)
 
-        # Find latest keyframe to start from
-        keyframe_id = await _find_latest_keyframe_id(stream_key)
-        if keyframe_id:
-            # Read from just before the keyframe (the keyframe entry itself)
-            # XREAD uses exclusive lower bound, so decrement the ID
-            parts = keyframe_id.split("-")
-            if len(parts) == 2:
-                ts_part, seq_part = parts
-                if int(seq_part) > 0:
-                    last_id = f"{ts_part}-{int(seq_part) - 1}"
-                else:
-                    last_id = f"{int(ts_part) - 1}-99999"
-    except Exception as e:
-        logger.debug("Late joiner setup failed, starting from live", extra={"error": str(e)})
-
-    # Backpressure tracking
-    sent_count = 0
-    dropped_count = 0
-
-    try:
-        while not disconnected.is_set():
-            try:
-                messages = await redis_pool.stream_read(
-                    stream_key, last_id=last_id, count=10, block=16
-                )
-            except Exception as e:
-                logger.warning(
-                    "Redis stream read error (video)",
-                    extra={"match_id": match_id, "error": str(e)},
-                )
-                await asyncio.sleep(0.1)
-                continue
-
-            if not messages:
-                continue
-
-            # Collect all entries from this batch
-            entries_to_send: list[tuple[str, dict]] = []
-            for _stream_name, entries in messages:
-                for msg_id, data in entries:
-                    last_id = msg_id
-                    entries_to_send.append((msg_id, data))
-
-            if not entries_to_send:
-                continue
-
-            # Keyframe-aware skip: when behind, keep latest keyframe + all deltas after it
-            if len(entries_to_send) > 3:
-                last_keyframe_idx = -1
-                for i, (_mid, d) in enumerate(entries_to_send):
-                    if d.get(b"type") in (b"key", b"seq", b"eos"):
-                        last_keyframe_idx = i
-                if last_keyframe_idx > 0:
-                    entries_to_send = entries_to_send[last_keyframe_idx:]
-
-            for _msg_id, data in entries_to_send:
-                nal_type = data.get(b"type", b"delta")
-
-                # EOS sentinel
-                if nal_type == b"eos":
-                    eos_frame = _build_ws_frame(TYPE_EOS, 0, 0)
-                    try:
-                        await websocket.send_bytes(eos_frame)
-                    except Exception:
-                        pass
-                    try:
-                        await websocket.close(code=1000, reason="Stream ended")
-                    except Exception:
-                        pass
+        while True:
+            # Coalesce any backlog behind this frame into one message; a control
+            # item (disconnect/EOS) ends the batch and is handled after it
+            frames: list[bytes] = []
+            item = await sub.queue.get()
+            while item is not None and item is not _EOS_FRAME:
+                frames.append(item)
+                if len(frames) == _BATCH_MAX_FRAMES or sub.queue.empty():
+                    break
+                item = sub.queue.get_nowait()
+
+            if frames:
+                payload = frames[0] if len(frames) == 1 else _build_batch(frames)
+                try:
+                    await websocket.send_bytes(payload)
+                except Exception:
                     return
+                sub.sent += len(frames)
+
+                # Check backpressure: too many frames dropped by the pump → disconnect
+                total = sub.sent + sub.dropped
+                if total >= _BACKPRESSURE_WINDOW:
+                    drop_rate = sub.dropped / total
+                    if drop_rate > _BACKPRESSURE_DROP_THRESHOLD:
+                        logger.warning(
+                            "Client too slow, disconnecting",
+                            extra={
+                                "match_id": match_id,
+                                "drop_rate": f"{drop_rate:.0%}",
+                            },
+                        )
+                        try:
+                            await websocket.close(code=4008, reason="Client too slow")
+                        except Exception:
+                            pass
+                        return
+                    # Reset counters for next window
+                    sub.sent = 0
+                    sub.dropped = 0
 
-                nal_data = data.get(b"nal", b"")
-                if not nal_data:
-                    continue
-
-                ts = int(data.get(b"ts", b"0"))
-                seq = int(data.get(b"seq", b"0"))
-                ws_type = _nal_type_to_ws_type(nal_type)
-                frame = _build_ws_frame(ws_type, ts, seq, nal_data)
+            if item is None:
+                return
 
+            if item is _EOS_FRAME:
                 try:
-                    await asyncio.wait_for(websocket.send_bytes(frame), timeout=0.05)
-                    sent_count += 1
-                except asyncio.TimeoutError:
-                    dropped_count += 1
-                    # Check backpressure: too many drops → disconnect
-                    total = sent_count + dropped_count
-                    if total >= _BACKPRESSURE_WINDOW:
-                        drop_rate = dropped_count / total
-                        if drop_rate > _BACKPRESSURE_DROP_THRESHOLD:
-                            logger.warning(
-                                "Client too slow, disconnecting",
-                                extra={
-                                    "match_id": match_id,
-                                    "drop_rate": f"{drop_rate:.0%}",
-                                },
-                            )
-                            try:
-                                await websocket.close(code=4008, reason="Client too slow")
-                            except Exception:
-                                pass
-                            return
-                        # Reset counters for next window
-                        sent_count = 0
-                        dropped_count = 0
+                    await websocket.send_bytes(item)
                 except Exception:
-                    return
+                    pass
+                try:
+                    await websocket.close(code=1000, reason="Stream ended")
+                except Exception:
+                    pass
+                return
 
     except WebSocketDisconnect:
         pass
     finally:
         watcher.cancel()
-        _video_connections[match_id].discard(websocket)
-        _ip_video_count[client_ip] = max(0, _ip_video_count[client_ip] - 1)
+        _detach(pump, sub)
+        _untrack(_video_connections, match_id, websocket)
+        _release(_ip_video_count, client_ip)
         ws_connections.labels(channel="video").dec()
         logger.info(
             "Video WebSocket disconnected",
@@ -285,13 +579,16 @@ async def data_channel(websocket: WebSocket, match_id: str) -> None:
 
     client_ip = _get_client_ip(websocket)
 
-    if _ip_data_count[client_ip] >= DATA_CONNECTIONS_PER_IP:
+    if not _try_reserve(_ip_data_count, client_ip, DATA_CONNECTIONS_PER_IP):
         await websocket.close(code=4029, reason="Too many data connections")
         return
 
-    await websocket.accept()
+    try:
+        await websocket.accept()
+    except Exception:
+        _release(_ip_data_count, client_ip)
+        raise
     _data_connections[match_id].add(websocket)
-    _ip_data_count[client_ip] += 1
     ws_connections.labels(channel="data").inc()
 
     logger.info(
@@ -299,42 +596,25 @@ async def data_channel(websocket: WebSocket, match_id: str) -> None:
         extra={"match_id": match_id, "client_ip": client_ip},
     )
 
-    disconnected = asyncio.Event()
-    watcher = asyncio.create_task(_watch_disconnect(websocket, disconnected))
-
-    stream_key = f"match:{match_id}:data"
-    last_id = "$"
+    pump, sub = _attach(match_id, f"match:{match_id}:data", _run_data_pump)
+    watcher = asyncio.create_task(_watch_disconnect(websocket, sub))
 
     try:
-        while not disconnected.is_set():
+        while True:
+            text = await sub.queue.get()
+            if text is None:
+                return
             try:
-                messages = await redis_pool.stream_read(
-                    stream_key, last_id=last_id, count=1, block=200
-                )
-            except Exception as e:
-                logger.warning("Redis stream read error (data)", extra={"match_id": match_id, "error": str(e)})
-                await asyncio.sleep(0.1)
-                continue
-
-            if not messages:
-                continue
-
-            for stream_name, entries in messages:
-                for msg_id, data in entries:
-                    last_id = msg_id
-
-                    # Build the 16-field data message
-                    msg = _build_data_message(match_id, data)
-                    try:
-                        await websocket.send_text(json.dumps(msg))
-                    except Exception:
-                        return
+                await websocket.send_text(text)
+            except Exception:
+                return
     except WebSocketDisconnect:
         pass
     finally:
         watcher.cancel()
-        _data_connections[match_id].discard(websocket)
-        _ip_data_count[client_ip] = max(0, _ip_data_count[client_ip] - 1)
+        _detach(pump, sub)
+        _untrack(_data_connections, match_id, websocket)
+        _release(_ip_data_count, client_ip)
         ws_connections.labels(channel="data").dec()
         logger.info(
             "Data WebSocket disconnected",
@@ -344,32 +624,19 @@ async def data_channel(websocket: WebSocket, match_id: str) -> None:
 
 def _build_data_message(match_id: str, raw_data: dict) -> dict:
     """Build the 16-field data channel message from Redis stream data."""
-
-    def _get(key: str, default=None):
-        val = raw_data.get(key.encode(), raw_data.get(key, default))
-        if isinstance(val, bytes):
-            val = val.decode()
-        return val
-
-    return {
-        "match_id": match_id,
-        "timestamp": _get("timestamp", ""),
-        "health_a": _safe_float(_get("p1_health", 0)) or 0,
-        "health_b": _safe_float(_get("p2_health", 0)) or 0,
-        "round": _safe_int(_get("round_number", 0)),
-        "timer": _safe_int(_get("timer", 0)),
-        "status": _get("status", "live"),
-        "round_winner": _safe_int_or_none(_get("round_winner")),
-        "match_winner": _safe_int_or_none(_get("match_winner")),
-        "team_health_a": _get("p1_team_health"),
-        "team_health_b": _get("p2_team_health"),
-        "active_char_a": _get("p1_active_character"),
-        "active_char_b": _get("p2_active_character"),
-        "has_round_timer": bool(_safe_int(_get("has_round_timer", 1))),
-        "odds_a": _safe_float(_get("odds_a")) or 0,
-        "odds_b": _safe_float(_get("odds_b")) or 0,
-        "pool_total": _safe_float(_get("pool_total")) or 0,
-    }
+    msg = {"match_id": match_id}
+    for name, key, str_key, convert, default in _DATA_FIELD_SPEC:
+        val = raw_data.get(key)
+        if val is None:
+            val = raw_data.get(str_key, default)
+        if convert is not None:
+            # int()/float() parse ASCII bytes directly; only text fields are decoded
+            msg[name] = convert(val)
+        elif isinstance(val, bytes):
+            msg[name] = val.decode()
+        else:
+            msg[name] = val
+    return msg
 
 
 def _safe_int_or_none(val) -> int | None:
@@ -397,3 +664,37 @@ def _safe_int(val) -> int:
         return int(val)
     except (ValueError, TypeError):
         return 0
+
+
+def _float_or_zero(val) -> float:
+    return _safe_float(val) or 0
+
+
+def _int_flag(val) -> bool:
+    return bool(_safe_int(val))
+
+
+# Data message fields: (message field, Redis field, converter, default).
+# Keys are encoded once here rather than on every lookup.
+_DATA_FIELDS = (
+    ("timestamp", "timestamp", None, ""),
+    ("health_a", "p1_health", _float_or_zero, 0),
+    ("health_b", "p2_health", _float_or_zero, 0),
+    ("round", "round_number", _safe_int, 0),
+    ("timer", "timer", _safe_int, 0),
+    ("status", "status", None, "live"),
+    ("round_winner", "round_winner", _safe_int_or_none, None),
+    ("match_winner", "match_winner", _safe_int_or_none, None),
+    ("team_health_a", "p1_team_health", None, None),
+    ("team_health_b", "p2_team_health", None, None),
+    ("active_char_a", "p1_active_character", None, None),
+    ("active_char_b", "p2_active_character", None, None),
+    ("has_round_timer", "has_round_timer", _int_flag, 1),
+    ("odds_a", "odds_a", _float_or_zero, None),
+    ("odds_b", "odds_b", _float_or_zero, None),
+    ("pool_total", "pool_total", _float_or_zero, None),
+)
+_DATA_FIELD_SPEC = tuple(
+    (name, key.encode(), key, convert, default)
+    for name, key, convert, default in _DATA_FIELDS
+)
@@ -14,9 +14,10 @@ import logging
 import struct
 import time
 import uuid as _uuid
-from collections import defaultdict, deque
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 
+import numpy as np
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
 from rawl.s3_client import download_byte_range, download_bytes, get_object_size
@@ -28,6 +29,10 @@ replay_router = APIRouter()
 # ─── Replay data container ───────────────────────────────────────────────────
 
 _CHUNK_SIZE = 300  # frames per chunk (~5 seconds at 60fps)
+_PREFETCH_DEPTH = 2  # chunks downloaded ahead of playback
+
+# Same compact encoding as the live data channel
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
 
 
 @dataclass
@@ -35,87 +40,138 @@ class _ReplayData:
     """Replay container that lazily fetches MJPEG chunks from S3."""
 
     match_id: str
-    offsets: list[int]
+    offsets: np.ndarray  # u64 byte offset of each frame in the MJPEG blob
     data_entries: list[dict]
     num_frames: int
     mjpeg_size: int
     size_bytes: int  # metadata size for cache accounting
 
     def __post_init__(self) -> None:
-        self._chunks: dict[int, bytes] = {}
-        self._chunk_lock = asyncio.Lock()
-
-    async def ensure_chunk(self, chunk_idx: int) -> bool:
-        """Download chunk from S3 if not cached. Evicts old chunks."""
-        if chunk_idx in self._chunks:
-            return True
-        async with self._chunk_lock:
-            if chunk_idx in self._chunks:
-                return True  # double-check after lock
-            start_frame = chunk_idx * _CHUNK_SIZE
-            end_frame = min(start_frame + _CHUNK_SIZE, self.num_frames)
-            byte_start = self.offsets[start_frame]
-            byte_end = (
-                self.offsets[end_frame]
-                if end_frame < self.num_frames
-                else self.mjpeg_size
-            )
-            data = await download_byte_range(
-                f"replays/{self.match_id}.mjpeg", byte_start, byte_end
-            )
-            if data is None:
-                return False
-            self._chunks[chunk_idx] = data
-            # Evict chunks more than 1 behind current
-            stale = [k for k in self._chunks if k < chunk_idx - 1]
-            for k in stale:
-                del self._chunks[k]
-            return True
-
-    async def extract_frame(self, index: int) -> bytes | None:
-        """Extract single JPEG frame, fetching chunk on demand."""
+        # 'frame' column of data_entries, searched instead of the dicts themselves
+        self.frames_arr = np.fromiter(
+            (entry.get("frame", 0) for entry in self.data_entries),
+            dtype=np.int64,
+            count=len(self.data_entries),
+        )
+        # entries never change once loaded, so serialize each frontend message once
+        self.data_messages = [
+            _ENCODER.encode(_translate_data_entry(self.match_id, entry))
+            for entry in self.data_entries
+        ]
+        # chunk index -> per-frame views into that chunk's downloaded bytes
+        self._chunks: dict[int, list[memoryview]] = {}
+        # chunk index -> download in progress, shared by every caller waiting on it
+        self._inflight: dict[int, asyncio.Task[list[memoryview] | None]] = {}
+
+    def nearest(self, frame: int) -> int:
+        """Index of the last data entry at or before frame, or -1 if there is none."""
+        return int(np.searchsorted(self.frames_arr, frame, side="right")) - 1
+
+    async def ensure_chunk(self, chunk_idx: int) -> list[memoryview] | None:
+        """Download chunk from S3 if not cached. Evicts old chunks.
+
+        Returns the chunk's frame views, or None if the download failed. Callers
+        read the returned list: another viewer's fetch may evict the chunk from
+        the cache before this one resumes.
+        """
+        chunk = self._chunks.get(chunk_idx)
+        if chunk is not None:
+            return chunk
+        # Shielded: a viewer disconnecting must not cancel a download others share
+        return await asyncio.shield(self._start_fetch(chunk_idx))
+
+    def prefetch(self, chunk_idx: int) -> None:
+        """Start downloading the chunks after chunk_idx concurrently."""
+        last_chunk = (self.num_frames - 1) // _CHUNK_SIZE
+        for k in range(chunk_idx + 1, min(chunk_idx + _PREFETCH_DEPTH, last_chunk) + 1):
+            if k not in self._chunks:
+                self._start_fetch(k)
+
+    def _start_fetch(self, chunk_idx: int) -> asyncio.Task[list[memoryview] | None]:
+        task = self._inflight.get(chunk_idx)
+        if task is None:
+            task = asyncio.create_task(self._fetch_chunk(chunk_idx))
+            self._inflight[chunk_idx] = task
+            task.add_done_callback(lambda _: self._inflight.pop(chunk_idx, None))
+        return task
+
+    async def _fetch_chunk(self, chunk_idx: int) -> list[memoryview] | None:
+        start_frame = chunk_idx * _CHUNK_SIZE
+        end_frame = min(start_frame + _CHUNK_SIZE, self.num_frames)
+        byte_start = int(self.offsets[start_frame])
+        byte_end = (
+            int(self.offsets[end_frame])
+            if end_frame < self.num_frames
+            else self.mjpeg_size
+        )
+        data = await download_byte_range(
+            f"replays/{self.match_id}.mjpeg", byte_start, byte_end
+        )
+        if data is None:
+            return None
+        # Slice every frame once here so extract_frame is a plain lookup
+        view = memoryview(data)
+        frame_offsets = np.asarray(self.offsets[start_frame:end_frame], dtype=np.int64)
+        bounds = (frame_offsets - byte_start).tolist()
+        bounds.append(len(data))
+        chunk = [view[bounds[k]:bounds[k + 1]] for k in range(end_frame - start_frame)]
+        self._chunks[chunk_idx] = chunk
+        # chunk_idx may be a prefetch up to _PREFETCH_DEPTH ahead of playback,
+        # so this window still keeps the chunk before the one playing
+        stale = [k for k in self._chunks if k < chunk_idx - _PREFETCH_DEPTH - 1]
+        for k in stale:
+            del self._chunks[k]
+        return chunk
+
+    async def extract_frame(self, index: int) -> memoryview | None:
+        """Extract single JPEG frame, fetching chunk on demand.
+
+        Returns a zero-copy view into the cached chunk.
+        """
         if index < 0 or index >= self.num_frames:
             return None
         chunk_idx = index // _CHUNK_SIZE
-        if not await self.ensure_chunk(chunk_idx):
+        chunk = await self.ensure_chunk(chunk_idx)
+        if chunk is None:
             return None
-        # Compute local offset within chunk
-        chunk_start_frame = chunk_idx * _CHUNK_SIZE
-        chunk_byte_base = self.offsets[chunk_start_frame]
-        local_start = self.offsets[index] - chunk_byte_base
-        local_end = (
-            (self.offsets[index + 1] - chunk_byte_base)
-            if index + 1 < self.num_frames
-            else len(self._chunks[chunk_idx])
-        )
-        return self._chunks[chunk_idx][local_start:local_end]
+        return chunk[index - chunk_idx * _CHUNK_SIZE]
 
 
 # ─── Replay cache ────────────────────────────────────────────────────────────
 
 _MAX_CACHE_ENTRIES = 3
 _CACHE_TTL_SECONDS = 600  # 10 minutes
+# Per-match download locks kept; requests for missing replays never reach _cache,
+# so their locks are only dropped by this cap
+_MAX_CACHE_LOCKS = 32
 
 
 class _ReplayCache:
     def __init__(self) -> None:
-        self._cache: dict[str, tuple[_ReplayData, float]] = {}
-        self._locks: dict[str, asyncio.Lock] = {}
+        # Least recently used first: hits move to the end, eviction pops the front
+        self._cache: OrderedDict[str, tuple[_ReplayData, float]] = OrderedDict()
+        self._locks: OrderedDict[str, asyncio.Lock] = OrderedDict()
         self._global_lock = asyncio.Lock()
 
     async def get(self, match_id: str) -> _ReplayData | None:
         """Get replay data, downloading from S3 if not cached."""
         # Get or create per-match lock under global lock
         async with self._global_lock:
-            if match_id not in self._locks:
-                self._locks[match_id] = asyncio.Lock()
-            lock = self._locks[match_id]
+            lock = self._locks.get(match_id)
+            if lock is None:
+                lock = self._locks[match_id] = asyncio.Lock()
+                # Dropping a lock still in use only risks one duplicate download
+                while len(self._locks) > _MAX_CACHE_LOCKS:
+                    self._locks.popitem(last=False)
+            else:
+                self._locks.move_to_end(match_id)
 
         async with lock:
             # Check cache hit
             if match_id in self._cache:
                 data, _ = self._cache[match_id]
                 self._cache[match_id] = (data, time.monotonic())
+                self._cache.move_to_end(match_id)
                 return data
 
             # Cache miss — download
@@ -131,8 +187,12 @@ class _ReplayCache:
 
     async def _download(self, match_id: str) -> _ReplayData | None:
         """Download only index + JSON sidecar (not MJPEG blob)."""
-        idx_bytes = await download_bytes(f"replays/{match_id}.idx")
-        json_bytes = await download_bytes(f"replays/{match_id}.json")
+        # Independent S3 round-trips: overlap them so cold start waits for the slowest
+        idx_bytes, json_bytes, mjpeg_size = await asyncio.gather(
+            download_bytes(f"replays/{match_id}.idx"),
+            download_bytes(f"replays/{match_id}.json"),
+            get_object_size(f"replays/{match_id}.mjpeg"),
+        )
         if not idx_bytes or not json_bytes:
             logger.error(
                 "Failed to download replay metadata",
@@ -140,7 +200,6 @@ class _ReplayCache:
             )
             return None
 
-        mjpeg_size = await get_object_size(f"replays/{match_id}.mjpeg")
         if mjpeg_size is None or mjpeg_size == 0:
             logger.error(
                 "Failed to get MJPEG size", extra={"match_id": match_id}
@@ -152,22 +211,23 @@ class _ReplayCache:
         if num_frames == 0:
             logger.error("Empty index file", extra={"match_id": match_id})
             return None
-        offsets = list(struct.unpack(f"<{num_frames}Q", idx_bytes))
+        offsets = np.frombuffer(idx_bytes, dtype="<u8", count=num_frames)
 
         # Validate offsets are monotonically increasing and within bounds
-        for i, offset in enumerate(offsets):
-            if offset >= mjpeg_size:
-                logger.error(
-                    "Corrupt index: offset beyond MJPEG",
-                    extra={"frame": i, "offset": offset},
-                )
-                return None
-            if i > 0 and offset <= offsets[i - 1]:
-                logger.error(
-                    "Corrupt index: non-monotonic offset",
-                    extra={"frame": i},
-                )
-                return None
+        non_monotonic = np.flatnonzero(offsets[1:] <= offsets[:-1])
+        if non_monotonic.size:
+            logger.error(
+                "Corrupt index: non-monotonic offset",
+                extra={"frame": int(non_monotonic[0]) + 1},
+            )
+            return None
+        if offsets[-1] >= mjpeg_size:
+            i = int(np.argmax(offsets >= mjpeg_size))
+            logger.error(
+                "Corrupt index: offset beyond MJPEG",
+                extra={"frame": i, "offset": int(offsets[i])},
+            )
+            return None
 
         # Parse data sidecar
         try:
@@ -176,29 +236,30 @@ class _ReplayCache:
             logger.error("Corrupt JSON sidecar", extra={"match_id": match_id})
             return None
 
-        return _ReplayData(
-            match_id=match_id,
-            offsets=offsets,
-            data_entries=data_entries,
-            num_frames=num_frames,
-            mjpeg_size=mjpeg_size,
-            size_bytes=len(idx_bytes) + len(json_bytes),
-        )
+        try:
+            return _ReplayData(
+                match_id=match_id,
+                offsets=offsets,
+                data_entries=data_entries,
+                num_frames=num_frames,
+                mjpeg_size=mjpeg_size,
+                size_bytes=len(idx_bytes) + len(json_bytes),
+            )
+        except (AttributeError, TypeError, ValueError):
+            logger.error("Corrupt JSON sidecar", extra={"match_id": match_id})
+            return None
 
     def _evict_if_needed(self) -> None:
         """Evict oldest entry if cache is full. Also evict expired entries.
 
         Must be called under self._global_lock.
         """
-        now = time.monotonic()
-        expired = [k for k, (_, ts) in self._cache.items() if now - ts > _CACHE_TTL_SECONDS]
-        for k in expired:
-            del self._cache[k]
-            self._locks.pop(k, None)
-
-        while len(self._cache) >= _MAX_CACHE_ENTRIES:
-            oldest = min(self._cache, key=lambda k: self._cache[k][1])
-            del self._cache[oldest]
+        # Entries are in access order, so expired ones are all at the front
+        cutoff = time.monotonic() - _CACHE_TTL_SECONDS
+        while self._cache and (
+            len(self._cache) >= _MAX_CACHE_ENTRIES or next(iter(self._cache.values()))[1] < cutoff
+        ):
+            oldest, _ = self._cache.popitem(last=False)
             self._locks.pop(oldest, None)
 
 
@@ -211,23 +272,26 @@ def _translate_data_entry(match_id: str, entry: dict) -> dict:
     """Translate raw state dict to 16-field frontend format.
 
     Same mapping as broadcaster._build_data_message but operating on
-    native Python dicts (not Redis byte-encoded data).
+    native Python dicts (not Redis byte-encoded data). Runs once per entry
+    when a replay loads, not per data tick.
     """
+    get = entry.get
+    # `or 0` also covers keys present with a JSON null
     return {
         "match_id": match_id,
-        "timestamp": str(entry.get("t", "")),
-        "health_a": float(entry.get("p1_health", 0) or 0),
-        "health_b": float(entry.get("p2_health", 0) or 0),
-        "round": int(entry.get("round_number", 0) or 0),
-        "timer": int(entry.get("timer", 0) or 0),
+        "timestamp": str(get("t", "")),
+        "health_a": float(get("p1_health", 0) or 0),
+        "health_b": float(get("p2_health", 0) or 0),
+        "round": int(get("round_number", 0) or 0),
+        "timer": int(get("timer", 0) or 0),
         "status": "replay",
-        "round_winner": entry.get("round_winner"),
-        "match_winner": entry.get("match_winner"),
-        "team_health_a": entry.get("p1_team_health"),
-        "team_health_b": entry.get("p2_team_health"),
-        "active_char_a": entry.get("p1_active_character"),
-        "active_char_b": entry.get("p2_active_character"),
-        "has_round_timer": entry.get("has_round_timer", True),
+        "round_winner": get("round_winner"),
+        "match_winner": get("match_winner"),
+        "team_health_a": get("p1_team_health"),
+        "team_health_b": get("p2_team_health"),
+        "active_char_a": get("p1_active_character"),
+        "active_char_b": get("p2_active_character"),
+        "has_round_timer": get("has_round_timer", True),
         "odds_a": 0,
         "odds_b": 0,
         "pool_total": 0,
@@ -236,31 +300,10 @@ def _translate_data_entry(match_id: str, entry: dict) -> dict:
 
 # ─── Helpers ─────────────────────────────────────────────────────────────────
 
-def _find_nearest_entry(
-    entries: list[dict], frame: int, start_idx: int,
-) -> tuple[dict, int] | None:
-    """Find the data entry with the largest 'frame' value <= frame, starting from start_idx.
-
-    Returns (entry, index) or None.
-    """
-    result = None
-    result_idx = start_idx
-    for i in range(start_idx, len(entries)):
-        entry_frame = entries[i].get("frame", 0)
-        if entry_frame <= frame:
-            result = entries[i]
-            result_idx = i
-        else:
-            break
-    if result is None:
-        return None
-    return result, result_idx
-
-
 def _get_client_ip(websocket: WebSocket) -> str:
     forwarded = websocket.headers.get("x-forwarded-for")
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        return forwarded.partition(",")[0].strip()
     client = websocket.client
     return client.host if client else "unknown"
 
@@ -276,22 +319,59 @@ async def _watch_disconnect(websocket: WebSocket, event: asyncio.Event) -> None:
     event.set()
 
 
+def _wake(tick: asyncio.Future[None]) -> None:
+    # The stream task may have been cancelled while waiting on its frame deadline
+    if not tick.done():
+        tick.set_result(None)
+
+
 # ─── WebSocket endpoint ─────────────────────────────────────────────────────
 
 _MAX_STREAMS_PER_IP = 2
 _MAX_GLOBAL_STREAMS = 10
-_ip_stream_count: dict[str, int] = defaultdict(int)
+_ip_stream_count: dict[str, int] = {}
 _global_stream_count = 0
-_ip_lock = asyncio.Lock()
 
 REPLAY_FPS = 60
 DATA_INTERVAL = 6  # Send data every 6th frame (=10Hz at 60fps)
 
+# Clients connecting with ?coalesce=1 get the frame and data message of a data tick in
+# one binary message: [type:u8][jpeg_len:u32][jpeg][data JSON]. Frames sent alone are
+# bare JPEGs, which always start with 0xFF, so the type byte cannot be mistaken for one.
+TYPE_FRAME_DATA = 0x01
+_COALESCED_HEADER = struct.Struct(">BI")
+
+
+def _acquire_stream(client_ip: str) -> str | None:
+    """Claim a stream slot for an IP; returns the close reason if a limit is hit.
+
+    Checks and increments happen with no await in between, so concurrent
+    handshakes cannot both pass a limit and no lock is needed.
+    """
+    global _global_stream_count
+    ip_streams = _ip_stream_count.get(client_ip, 0)
+    if ip_streams >= _MAX_STREAMS_PER_IP:
+        return "Too many replay streams"
+    if _global_stream_count >= _MAX_GLOBAL_STREAMS:
+        return "Server at replay capacity"
+    _ip_stream_count[client_ip] = ip_streams + 1
+    _global_stream_count += 1
+    return None
+
+
+def _release_stream(client_ip: str) -> None:
+    """Return a slot claimed by _acquire_stream, dropping the IP at zero."""
+    global _global_stream_count
+    remaining = _ip_stream_count.get(client_ip, 0) - 1
+    if remaining > 0:
+        _ip_stream_count[client_ip] = remaining
+    else:
+        _ip_stream_count.pop(client_ip, None)
+    _global_stream_count = max(0, _global_stream_count - 1)
+
 
 @replay_router.websocket("/replay/{match_id}")
 async def replay_endpoint(websocket: WebSocket, match_id: str) -> None:
-    global _global_stream_count  # mutated under _ip_lock
-
     # Validate match_id is a UUID
     try:
         _uuid.UUID(match_id)
@@ -299,17 +379,12 @@ async def replay_endpoint(websocket: WebSocket, match_id: str) -> None:
         await websocket.close(code=4000, reason="Invalid match_id")
         return
 
-    # Connection limits — acquire slot under lock
+    # Connection limits — acquire slot before accepting
     client_ip = _get_client_ip(websocket)
-    async with _ip_lock:
-        if _ip_stream_count[client_ip] >= _MAX_STREAMS_PER_IP:
-            await websocket.close(code=4029, reason="Too many replay streams")
-            return
-        if _global_stream_count >= _MAX_GLOBAL_STREAMS:
-            await websocket.close(code=4029, reason="Server at replay capacity")
-            return
-        _ip_stream_count[client_ip] += 1
-        _global_stream_count += 1
+    rejected = _acquire_stream(client_ip)
+    if rejected is not None:
+        await websocket.close(code=4029, reason=rejected)
+        return
 
     # Accept AFTER acquiring slot
     await websocket.accept()
@@ -325,16 +400,21 @@ async def replay_endpoint(websocket: WebSocket, match_id: str) -> None:
             await websocket.close(code=4004, reason="Empty replay")
             return
 
+        coalesce = websocket.query_params.get("coalesce") == "1"
+
         # Set up disconnect detection
         disconnected = asyncio.Event()
         watcher = asyncio.create_task(_watch_disconnect(websocket, disconnected))
 
         # Stream frames at 60fps with drift correction and backpressure
-        stream_start = time.monotonic()
-        data_cursor = 0
+        loop = asyncio.get_running_loop()
+        stream_start = loop.time()
         SEND_TIMEOUT = 0.050  # 50ms — ~3 frame periods at 60fps
         MAX_DROP_RATIO = 0.8  # disconnect if >80% drops in window
         drop_window: deque[bool] = deque(maxlen=60)
+        # Per-frame sends build the ASGI message directly instead of going through
+        # send_bytes/send_text; a fresh dict each time since the server owns it once sent
+        send = websocket.send
 
         try:
             for i in range(replay.num_frames):
@@ -350,17 +430,30 @@ async def replay_endpoint(websocket: WebSocket, match_id: str) -> None:
                     )
                     break
 
-                # Prefetch next chunk when entering the last 20% of current
+                # Prefetch upcoming chunks when entering the last 20% of current
                 frames_into_chunk = i % _CHUNK_SIZE
                 if frames_into_chunk == int(_CHUNK_SIZE * 0.8):
-                    next_chunk = (i // _CHUNK_SIZE) + 1
-                    if next_chunk * _CHUNK_SIZE < replay.num_frames:
-                        asyncio.create_task(replay.ensure_chunk(next_chunk))
+                    replay.prefetch(i // _CHUNK_SIZE)
+
+                # Data message due at 10Hz (every DATA_INTERVAL frames)
+                data_msg = None
+                if i % DATA_INTERVAL == 0 and replay.data_messages:
+                    entry_idx = replay.nearest(i + 1)
+                    if entry_idx >= 0:
+                        data_msg = replay.data_messages[entry_idx]
+
+                payload: bytes | memoryview = frame_bytes
+                if coalesce and data_msg is not None:
+                    # One allocation: join sizes the result once and copies each part in
+                    header = _COALESCED_HEADER.pack(TYPE_FRAME_DATA, len(frame_bytes))
+                    payload = b"".join((header, frame_bytes, data_msg.encode()))
+                    data_msg = None
 
                 # Send frame with backpressure
                 try:
                     await asyncio.wait_for(
-                        websocket.send_bytes(frame_bytes), timeout=SEND_TIMEOUT
+                        send({"type": "websocket.send", "bytes": payload}),
+                        timeout=SEND_TIMEOUT,
                     )
                     drop_window.append(False)
                 except asyncio.TimeoutError:
@@ -380,32 +473,26 @@ async def replay_endpoint(websocket: WebSocket, match_id: str) -> None:
                 except Exception:
                     break
 
-                # Send data at 10Hz (every DATA_INTERVAL frames)
-                if i % DATA_INTERVAL == 0 and replay.data_entries:
-                    found = _find_nearest_entry(
-                        replay.data_entries, i + 1, data_cursor
-                    )
-                    if found is not None:
-                        entry, data_cursor = found
-                        msg = _translate_data_entry(match_id, entry)
-                        try:
-                            await asyncio.wait_for(
-                                websocket.send_text(json.dumps(msg)),
-                                timeout=SEND_TIMEOUT,
-                            )
-                        except (asyncio.TimeoutError, Exception):
-                            pass  # data message drops are non-fatal
-
-                # Drift-corrected pacing
-                target_time = stream_start + (i + 1) / REPLAY_FPS
-                sleep_time = target_time - time.monotonic()
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
+                if data_msg is not None:
+                    try:
+                        await asyncio.wait_for(
+                            send({"type": "websocket.send", "text": data_msg}),
+                            timeout=SEND_TIMEOUT,
+                        )
+                    except (asyncio.TimeoutError, Exception):
+                        pass  # data message drops are non-fatal
+
+                # Drift-corrected pacing: wake at the frame's absolute deadline
+                deadline = stream_start + (i + 1) / REPLAY_FPS
+                if deadline > loop.time():
+                    tick = loop.create_future()
+                    loop.call_at(deadline, _wake, tick)
+                    await tick
 
             # Send end signal
             if not disconnected.is_set():
                 try:
-                    await websocket.send_text(json.dumps({"status": "ended"}))
+                    await websocket.send_text(_ENCODER.encode({"status": "ended"}))
                 except Exception:
                     pass
 
@@ -415,6 +502,4 @@ async def replay_endpoint(websocket: WebSocket, match_id: str) -> None:
     except WebSocketDisconnect:
         pass
     finally:
-        async with _ip_lock:
-            _ip_stream_count[client_ip] = max(0, _ip_stream_count[client_ip] - 1)
-            _global_stream_count = max(0, _global_stream_count - 1)
+        _release_stream(client_ip)
@@ -12,6 +12,9 @@ logger = logging.getLogger(__name__)
 
 training_ws_router = APIRouter()
 
+# Compact separators: smaller frames and a reused encoder instead of json.dumps per entry
+_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
 
 @training_ws_router.websocket("/training/{job_id}")
 async def training_progress(websocket: WebSocket, job_id: str) -> None:
@@ -34,14 +37,12 @@ async def training_progress(websocket: WebSocket, job_id: str) -> None:
             if not messages:
                 continue
 
-            for stream_name, entries in messages:
-                for msg_id, data in entries:
-                    last_id = msg_id
-                    decoded = {
-                        k.decode() if isinstance(k, bytes) else k: v.decode() if isinstance(v, bytes) else v
-                        for k, v in data.items()
-                    }
-                    await websocket.send_text(json.dumps(decoded))
+            for _, entries in messages:
+                last_id = entries[-1][0]
+                for _, data in entries:
+                    # The pool never decodes responses, so fields are always bytes
+                    decoded = {k.decode(): v.decode() for k, v in data.items()}
+                    await websocket.send_text(_ENCODER.encode(decoded))
     except WebSocketDisconnect:
         pass
     except Exception:
@@ -1,17 +1,20 @@
 """Shared test fixtures for integration tests.
 
 Uses an in-memory SQLite database via aiosqlite for isolation
-(no external DB needed). External services (Redis, Solana, Celery)
-are mocked. PostgreSQL-specific UUID columns are compiled as
-VARCHAR(36) on SQLite via a type compiler patch.
+(no external DB needed). Redis runs on an in-process fakeredis server;
+other external services are mocked. PostgreSQL-specific UUID columns
+are compiled as VARCHAR(36) on SQLite via a type compiler patch.
 """
 from __future__ import annotations
 
 import time
 import uuid
 from contextlib import asynccontextmanager
-from unittest.mock import AsyncMock, MagicMock, patch
+from functools import lru_cache
+from unittest.mock import AsyncMock
 
+import fakeredis
+import fakeredis.aioredis
 import jwt
 import pytest
 from httpx import ASGITransport, AsyncClient
@@ -29,6 +32,7 @@ from rawl.db.models.match import Match
 from rawl.db.models.training_job import TrainingJob
 from rawl.db.models.user import User
 from rawl.gateway.auth import derive_api_key, hash_api_key
+from rawl.redis_client import RedisPool
 
 # ---------------------------------------------------------------------------
 # SQLite UUID compat — teach SQLite to compile PG UUID as VARCHAR(36)
@@ -46,194 +50,80 @@ if not hasattr(_sqlite_base.SQLiteTypeCompiler, "visit_UUID"):
 
 TEST_DATABASE_URL = "sqlite+aiosqlite://"
 
-_test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
 
-_tables_created = False
+@pytest.fixture(scope="session")
+async def db_connection():
+    """One connection for the whole run, with the schema created once."""
+    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    async with engine.connect() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.commit()
+        yield conn
+    await engine.dispose()
 
 
 @pytest.fixture
-async def db_session():
-    """Per-test session with rollback for isolation."""
-    global _tables_created
-    if not _tables_created:
-        async with _test_engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        _tables_created = True
-
-    conn = await _test_engine.connect()
-    txn = await conn.begin()
-    session = AsyncSession(bind=conn, expire_on_commit=False)
+async def db_session(db_connection):
+    """Per-test session with rollback for isolation.
+
+    The session joins the test's outer transaction, so commits made by the
+    code under test leave it open for the rollback below to discard.
+    """
+    txn = await db_connection.begin()
+    session = AsyncSession(bind=db_connection, expire_on_commit=False)
 
     yield session
 
     await session.close()
     await txn.rollback()
-    await conn.close()
+
+
+@pytest.fixture
+def session_factory(db_session):
+    """Stand-in for worker_session_factory whose sessions are db_session."""
+
+    @asynccontextmanager
+    async def factory():
+        yield db_session
+
+    return factory
 
 
 # ---------------------------------------------------------------------------
 # Mock external services
 # ---------------------------------------------------------------------------
 
-@pytest.fixture(autouse=True)
-def mock_redis():
-    """Replace redis_pool with an in-memory mock for all tests."""
-    store: dict[str, bytes | str | int] = {}
-    ttls: dict[str, int] = {}
-    sorted_sets: dict[str, dict[str, float]] = {}
-
-    mock = MagicMock()
-
-    async def _get(key):
-        return store.get(key)
-
-    async def _set(key, value, **kwargs):
-        store[key] = value
-        if "ex" in kwargs:
-            ttls[key] = kwargs["ex"]
-
-    async def _incr(key):
-        val = int(store.get(key, 0)) + 1
-        store[key] = val
-        return val
-
-    async def _expire(key, seconds):
-        ttls[key] = seconds
-
-    async def _ttl(key):
-        return ttls.get(key, -1)
-
-    async def _delete(*keys):
-        for k in keys:
-            store.pop(k, None)
-
-    async def _ping():
-        return True
-
-    async def _scan(cursor=0, match=None, count=None):
-        all_keys = list(store.keys()) + list(sorted_sets.keys())
-        if match:
-            import fnmatch
-            all_keys = [k for k in all_keys if fnmatch.fnmatch(k, match)]
-        return (0, all_keys)
-
-    async def _zadd(key, mapping, **kwargs):
-        if key not in sorted_sets:
-            sorted_sets[key] = {}
-        sorted_sets[key].update(mapping)
-
-    async def _zrange(key, start, end, withscores=False, **kwargs):
-        ss = sorted_sets.get(key, {})
-        items = sorted(ss.items(), key=lambda x: x[1])
-        if end == -1:
-            items = items[start:]
-        else:
-            items = items[start : end + 1]
-        if withscores:
-            return items
-        return [m for m, _ in items]
-
-    async def _zrangebyscore(key, min_s, max_s, withscores=False, **kwargs):
-        ss = sorted_sets.get(key, {})
-        items = [
-            (m, s)
-            for m, s in sorted(ss.items(), key=lambda x: x[1])
-            if min_s <= s <= max_s
-        ]
-        if withscores:
-            return items
-        return [m for m, _ in items]
-
-    async def _zrem(key, *members):
-        ss = sorted_sets.get(key, {})
-        for m in members:
-            ss.pop(m, None)
-
-    def _pipeline():
-        pipe = MagicMock()
-        _pipe_ops = []
-
-        def _pipe_zadd(key, mapping, **kwargs):
-            _pipe_ops.append(("zadd", key, mapping))
-
-        def _pipe_set(key, value, **kwargs):
-            _pipe_ops.append(("set", key, value, kwargs))
-
-        def _pipe_zrem(key, *members):
-            _pipe_ops.append(("zrem", key, members))
-
-        def _pipe_delete(*keys):
-            _pipe_ops.append(("delete", keys))
-
-        async def _pipe_execute():
-            for op in _pipe_ops:
-                if op[0] == "zadd":
-                    await _zadd(op[1], op[2])
-                elif op[0] == "set":
-                    await _set(op[1], op[2], **op[3])
-                elif op[0] == "zrem":
-                    await _zrem(op[1], *op[2])
-                elif op[0] == "delete":
-                    await _delete(*op[1])
-            _pipe_ops.clear()
-
-        pipe.zadd = _pipe_zadd
-        pipe.set = _pipe_set
-        pipe.zrem = _pipe_zrem
-        pipe.delete = _pipe_delete
-        pipe.execute = _pipe_execute
-        return pipe
-
-    mock.get = _get
-    mock.set = _set
-    mock.incr = _incr
-    mock.expire = _expire
-    mock.ttl = _ttl
-    mock.delete = _delete
-    mock.ping = _ping
-    mock.scan = _scan
-    mock.zadd = _zadd
-    mock.zrange = _zrange
-    mock.zrangebyscore = _zrangebyscore
-    mock.zrem = _zrem
-    mock.pipeline = _pipeline
-    async def _rate_limit_check(key: str, limit: int, window_seconds: int) -> bool:
-        val = int(store.get(key, 0)) + 1
-        store[key] = val
-        if val == 1:
-            ttls[key] = window_seconds
-        return val <= limit
-
-    async def _atomic_pair_remove(key: str, member_a: str, member_b: str) -> bool:
-        ss = sorted_sets.get(key, {})
-        if member_a in ss and member_b in ss:
-            ss.pop(member_a)
-            ss.pop(member_b)
-            return True
-        return False
-
-    mock.rate_limit_check = _rate_limit_check
-    mock.atomic_pair_remove = _atomic_pair_remove
-    mock.initialize = AsyncMock()
-    mock.close = AsyncMock()
-
-    with patch("rawl.redis_client.redis_pool", mock), \
-         patch("rawl.api.middleware.redis_pool", mock), \
-         patch("rawl.gateway.routes.submit.redis_pool", mock), \
-         patch("rawl.services.match_queue.redis_pool", mock):
-        yield mock
+@pytest.fixture
+def mock_redis(monkeypatch):
+    """Replace redis_pool with a RedisPool over a fresh in-process fakeredis server.
+
+    The real wrapper methods and Lua helpers run against it. Opt-in: the app
+    fixture pulls it in for HTTP tests; other tests that touch Redis request
+    it by name.
+    """
+    pool = RedisPool()
+    pool._pool = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer())
+
+    for target in (
+        "rawl.redis_client.redis_pool",
+        "rawl.api.middleware.redis_pool",
+        "rawl.gateway.routes.submit.redis_pool",
+        "rawl.services.match_queue.redis_pool",
+    ):
+        monkeypatch.setattr(target, pool)
+    return pool
 
 
-@pytest.fixture(autouse=True)
-def mock_evm():
-    """Replace EVM client with AsyncMock."""
+@pytest.fixture
+def mock_evm(monkeypatch):
+    """Replace EVM client with AsyncMock (opt-in, like mock_redis)."""
     mock = AsyncMock()
     mock.initialize = AsyncMock()
     mock.close = AsyncMock()
     mock.get_health = AsyncMock(return_value=True)
     mock.create_match_on_chain = AsyncMock(return_value="0xfake_tx_hash")
-    with patch("rawl.evm.client.evm_client", mock):
-        yield mock
+    monkeypatch.setattr("rawl.evm.client.evm_client", mock)
+    return mock
 
 
 # ---------------------------------------------------------------------------
@@ -245,38 +135,58 @@ async def _noop_lifespan(app):
     yield
 
 
-@pytest.fixture
-async def app(db_session):
-    """FastAPI app with overridden DB dependency and no lifespan."""
-    from rawl.dependencies import get_db
+@pytest.fixture(scope="session")
+def _app():
+    """FastAPI app with no lifespan, built once for the whole run."""
     from rawl.main import create_app
 
     application = create_app()
     application.router.lifespan_context = _noop_lifespan
     application.state.arq_pool = AsyncMock()
+    return application
+
+
+@pytest.fixture
+async def app(_app, db_session, mock_redis, mock_evm):
+    """The shared app with its DB dependency overridden for this test."""
+    from rawl.dependencies import get_db
 
     async def override_get_db():
         yield db_session
 
-    application.dependency_overrides[get_db] = override_get_db
-    yield application
-    application.dependency_overrides.clear()
+    _app.state.arq_pool.reset_mock()
+    _app.dependency_overrides[get_db] = override_get_db
+    yield _app
+    _app.dependency_overrides.clear()
 
 
-@pytest.fixture
-async def client(app) -> AsyncClient:
-    """httpx AsyncClient for making requests against the test app."""
-    transport = ASGITransport(app=app)
+@pytest.fixture(scope="session")
+async def _client(_app) -> AsyncClient:
+    """One httpx AsyncClient over the shared app for the whole run."""
+    transport = ASGITransport(app=_app)
     async with AsyncClient(transport=transport, base_url="http://test") as c:
         yield c
 
 
+@pytest.fixture
+def client(app, _client) -> AsyncClient:
+    """httpx AsyncClient for making requests against the test app."""
+    _client.cookies.clear()
+    return _client
+
+
 # ---------------------------------------------------------------------------
 # Auth helpers
 # ---------------------------------------------------------------------------
 
 def make_internal_token(expired: bool = False) -> str:
     """Create an internal JWT token for testing."""
+    return _signed_internal_token(expired, int(time.time()) // 60)
+
+
+@lru_cache(maxsize=4)
+def _signed_internal_token(expired: bool, minute: int) -> str:
+    # Re-signed once a minute; a live token keeps >= 4 of its 5 minutes of validity
     now = int(time.time())
     payload = {
         "iss": "rawl-frontend",
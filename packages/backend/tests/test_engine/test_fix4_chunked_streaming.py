@@ -3,16 +3,16 @@
 1. s3_client has download_byte_range and get_object_size
 2. _ReplayData lazily fetches chunks, not entire MJPEG
 3. Frame extraction works with chunked data
-4. Old chunks are evicted (only keep current and previous)
+4. Old chunks are evicted (keep the previous chunk through the prefetch window)
 5. Prefetch trigger fires at 80% through a chunk
 """
 from __future__ import annotations
 
 import asyncio
 import struct
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from rawl.ws.replay_streamer import _CHUNK_SIZE, _ReplayData
+from rawl.ws.replay_streamer import _CHUNK_SIZE, _PREFETCH_DEPTH, _ReplayData
 
 
 def _make_test_replay(num_frames: int = 600) -> tuple[_ReplayData, bytes]:
@@ -97,9 +97,9 @@ class TestReplayDataChunkedFetch:
             # Chunk 0 should still be cached
             assert len(download_calls) == 2, "Chunk 0 should still be cached"
 
-    async def test_old_chunks_evicted(self):
-        """Chunks more than 1 behind current are evicted."""
-        replay, mjpeg = _make_test_replay(900)
+    async def test_extract_frame_is_view_into_chunk(self):
+        """Frames are zero-copy views sliced once per chunk download."""
+        replay, mjpeg = _make_test_replay(600)
 
         async def mock_download_range(key, start, end):
             return mjpeg[start:end]
@@ -108,20 +108,76 @@ class TestReplayDataChunkedFetch:
             "rawl.ws.replay_streamer.download_byte_range",
             side_effect=mock_download_range,
         ):
-            # Fetch chunk 0
-            await replay.extract_frame(0)
-            assert 0 in replay._chunks
+            first = await replay.extract_frame(300)
+            again = await replay.extract_frame(300)
 
-            # Fetch chunk 1 — chunk 0 still kept (only 1 behind)
-            await replay.extract_frame(300)
-            assert 0 in replay._chunks
-            assert 1 in replay._chunks
+        assert isinstance(first, memoryview)
+        assert first is again
+        assert first == mjpeg[300 * 100 : 301 * 100]
+
+    async def test_old_chunks_evicted(self):
+        """Chunks behind the prefetch window are evicted."""
+        replay, mjpeg = _make_test_replay(1500)
+
+        async def mock_download_range(key, start, end):
+            return mjpeg[start:end]
 
-            # Fetch chunk 2 — chunk 0 evicted (2 behind)
-            await replay.extract_frame(600)
+        with patch(
+            "rawl.ws.replay_streamer.download_byte_range",
+            side_effect=mock_download_range,
+        ):
+            for chunk in range(_PREFETCH_DEPTH + 3):
+                await replay.extract_frame(chunk * _CHUNK_SIZE)
+            # Fetching chunk DEPTH+2 keeps chunks 1..DEPTH+2 and drops chunk 0
             assert 0 not in replay._chunks, "Chunk 0 should be evicted"
-            assert 1 in replay._chunks
-            assert 2 in replay._chunks
+            assert sorted(replay._chunks) == list(range(1, _PREFETCH_DEPTH + 3))
+
+    async def test_viewers_on_distant_chunks_both_get_frames(self):
+        """A fetch for a far-ahead chunk must not evict one another viewer awaits."""
+        replay, mjpeg = _make_test_replay(8 * _CHUNK_SIZE)
+
+        async def mock_download_range(key, start, end):
+            await asyncio.sleep(0.01)
+            return mjpeg[start:end]
+
+        with patch(
+            "rawl.ws.replay_streamer.download_byte_range",
+            side_effect=mock_download_range,
+        ):
+            early, late = await asyncio.gather(
+                replay.extract_frame(0), replay.extract_frame(5 * _CHUNK_SIZE)
+            )
+
+        assert early == mjpeg[0:100]
+        assert late == mjpeg[5 * _CHUNK_SIZE * 100 : (5 * _CHUNK_SIZE + 1) * 100]
+
+    async def test_prefetch_downloads_ahead_concurrently(self):
+        """prefetch starts every upcoming chunk at once, each downloaded once."""
+        replay, mjpeg = _make_test_replay(1500)
+        started = []
+        release = asyncio.Event()
+
+        async def mock_download_range(key, start, end):
+            started.append(start // (_CHUNK_SIZE * 100))
+            await release.wait()
+            return mjpeg[start:end]
+
+        with patch(
+            "rawl.ws.replay_streamer.download_byte_range",
+            side_effect=mock_download_range,
+        ):
+            replay.prefetch(0)
+            await asyncio.sleep(0)
+            expected = list(range(1, _PREFETCH_DEPTH + 1))
+            assert started == expected
+
+            # A playback request for an in-flight chunk joins that download
+            waiter = asyncio.create_task(replay.ensure_chunk(1))
+            await asyncio.sleep(0)
+            release.set()
+            assert await waiter
+            assert started == expected
+            assert sorted(replay._chunks) == expected
 
     async def test_extract_frame_out_of_range(self):
         """Out-of-range frame returns None."""
@@ -159,6 +215,40 @@ class TestReplayDataChunkedFetch:
             assert frame is None
 
 
+class TestEntryLookup:
+    def test_nearest_returns_latest_entry(self):
+        replay, _ = _make_test_replay(num_frames=20)
+        # entries at frames 0, 6, 12, 18
+        assert replay.frames_arr.tolist() == [0, 6, 12, 18]
+        assert replay.nearest(0) == 0
+        assert replay.nearest(5) == 0
+        assert replay.nearest(6) == 1
+        assert replay.nearest(17) == 2
+        assert replay.nearest(20) == 3
+
+    def test_frames_before_first_entry_have_no_entry(self):
+        replay = _ReplayData(
+            match_id="m",
+            offsets=[0, 10, 20, 30],
+            data_entries=[{"frame": 2}, {"frame": 3}],
+            num_frames=4,
+            mjpeg_size=40,
+            size_bytes=0,
+        )
+        assert [replay.nearest(f) for f in range(5)] == [-1, -1, 0, 1, 1]
+
+    def test_data_messages_precomputed_per_entry(self):
+        import json
+
+        from rawl.ws.replay_streamer import _translate_data_entry
+
+        replay, _ = _make_test_replay(num_frames=20)
+        assert len(replay.data_messages) == len(replay.data_entries)
+        assert json.loads(replay.data_messages[2]) == _translate_data_entry(
+            "test-match", replay.data_entries[2]
+        )
+
+
 class TestPrefetchTrigger:
     def test_prefetch_fires_at_80_percent(self):
         """Prefetch should fire when frames_into_chunk == int(CHUNK_SIZE * 0.8)."""
@@ -198,3 +288,115 @@ class TestS3ClientHelpers:
         with patch("rawl.s3_client._get_client", side_effect=Exception("no S3")):
             result = await get_object_size("nonexistent-key")
             assert result is None
+
+    async def test_download_to_file_streams_chunks(self, tmp_path):
+        from rawl.s3_client import download_to_file
+
+        async def iter_chunks(size):
+            for chunk in (b"abc", b"de"):
+                yield chunk
+
+        body = MagicMock()
+        body.iter_chunks = iter_chunks
+        client = MagicMock()
+        client.get_object = AsyncMock(return_value={"Body": body})
+        client.__aenter__ = AsyncMock(return_value=client)
+        client.__aexit__ = AsyncMock(return_value=False)
+
+        dest = tmp_path / "model.zip"
+        with patch("rawl.s3_client._get_client", AsyncMock(return_value=client)):
+            written = await download_to_file("models/x.zip", str(dest))
+        assert written == 5
+        assert dest.read_bytes() == b"abcde"
+
+    async def test_download_to_file_returns_none_on_error(self, tmp_path):
+        from rawl.s3_client import download_to_file
+
+        with patch("rawl.s3_client._get_client", side_effect=Exception("no S3")):
+            assert await download_to_file("models/x.zip", str(tmp_path / "m.zip")) is None
+
+    async def test_upload_file_streams_from_path(self, tmp_path):
+        from rawl.s3_client import upload_file
+
+        client = MagicMock()
+        client.upload_file = AsyncMock()
+        client.__aenter__ = AsyncMock(return_value=client)
+        client.__aexit__ = AsyncMock(return_value=False)
+
+        src = tmp_path / "model.zip"
+        src.write_bytes(b"zip")
+        with patch("rawl.s3_client._get_client", AsyncMock(return_value=client)):
+            assert await upload_file("models/x.zip", str(src), "application/zip") is True
+        args, kwargs = client.upload_file.await_args
+        assert args[0] == str(src)
+        assert args[2] == "models/x.zip"
+        assert kwargs["ExtraArgs"] == {"ContentType": "application/zip"}
+
+
+class TestReplayIndexParsing:
+    async def _download(
+        self, offsets: list[int], mjpeg_size: int = 1000, json_bytes: bytes = b"[]"
+    ):
+        from rawl.ws.replay_streamer import _ReplayCache
+
+        idx_bytes = struct.pack(f"<{len(offsets)}Q", *offsets)
+        sidecars = {"replays/m.idx": idx_bytes, "replays/m.json": json_bytes}
+
+        async def mock_download_bytes(key):
+            return sidecars[key]
+
+        with patch(
+            "rawl.ws.replay_streamer.download_bytes", side_effect=mock_download_bytes
+        ), patch(
+            "rawl.ws.replay_streamer.get_object_size", AsyncMock(return_value=mjpeg_size)
+        ):
+            return await _ReplayCache()._download("m")
+
+    async def test_valid_index(self):
+        replay = await self._download([0, 100, 250])
+        assert replay is not None
+        assert replay.num_frames == 3
+        assert replay.offsets.tolist() == [0, 100, 250]
+
+    async def test_non_monotonic_index_rejected(self):
+        assert await self._download([0, 100, 100]) is None
+
+    async def test_offset_beyond_mjpeg_rejected(self):
+        assert await self._download([0, 100, 1000], mjpeg_size=1000) is None
+
+    async def test_malformed_data_entry_rejected(self):
+        bad = b'[{"frame": 0, "p1_health": "full"}]'
+        assert await self._download([0, 100], json_bytes=bad) is None
+
+    async def test_metadata_requests_overlap(self):
+        """Index, sidecar and size lookups are all in flight at once."""
+        from rawl.ws.replay_streamer import _ReplayCache
+
+        in_flight = 0
+        peak = 0
+
+        async def track(result):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return result
+
+        sidecars = {"replays/m.idx": struct.pack("<2Q", 0, 100), "replays/m.json": b"[]"}
+
+        async def mock_download_bytes(key):
+            return await track(sidecars[key])
+
+        async def mock_object_size(key):
+            return await track(1000)
+
+        with patch(
+            "rawl.ws.replay_streamer.download_bytes", side_effect=mock_download_bytes
+        ), patch(
+            "rawl.ws.replay_streamer.get_object_size", side_effect=mock_object_size
+        ):
+            replay = await _ReplayCache()._download("m")
+
+        assert replay is not None
+        assert peak == 3
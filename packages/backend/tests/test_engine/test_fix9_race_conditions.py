@@ -1,7 +1,7 @@
 """Verify FIX 9: Cache eviction race + stream counter race.
 
 1. Cache eviction happens under global lock (lock cleanup included)
-2. Stream counters are protected by _ip_lock
+2. Stream counters are claimed without an await between check and increment
 3. Concurrent connection attempts respect limits atomically
 """
 from __future__ import annotations
@@ -79,6 +79,34 @@ class TestCacheEvictionUnderLock:
         assert "mid" in cache._cache
         assert "new" in cache._cache
 
+    async def test_cache_hit_protects_entry_from_eviction(self):
+        """A hit moves the entry to the back of the eviction order."""
+        import time as _time
+
+        cache = _ReplayCache()
+        now = _time.monotonic()
+        for mid in ("a", "b", "c"):
+            cache._cache[mid] = (MagicMock(), now + 100)
+
+        await cache.get("a")
+        async with cache._global_lock:
+            cache._evict_if_needed()
+
+        assert list(cache._cache) == ["c", "a"]
+
+    async def test_locks_for_missing_replays_are_bounded(self):
+        """Lookups that never reach the cache cannot grow _locks without limit."""
+        from rawl.ws.replay_streamer import _MAX_CACHE_LOCKS
+
+        cache = _ReplayCache()
+        with patch.object(cache, "_download", AsyncMock(return_value=None)):
+            for i in range(_MAX_CACHE_LOCKS + 10):
+                assert await cache.get(f"missing-{i}") is None
+
+        assert len(cache._locks) == _MAX_CACHE_LOCKS
+        assert f"missing-{_MAX_CACHE_LOCKS + 9}" in cache._locks
+        assert "missing-0" not in cache._locks
+
 
 class TestStreamCounterAtomicity:
     async def test_concurrent_connections_respect_global_limit(self):
@@ -99,16 +127,10 @@ class TestStreamCounterAtomicity:
 
             async def try_connect(ip: str):
                 nonlocal accepted, rejected
-                async with mod._ip_lock:
-                    if mod._ip_stream_count[ip] >= _MAX_STREAMS_PER_IP:
-                        rejected += 1
-                        return
-                    if mod._global_stream_count >= _MAX_GLOBAL_STREAMS:
-                        rejected += 1
-                        return
-                    mod._ip_stream_count[ip] += 1
-                    mod._global_stream_count += 1
+                if mod._acquire_stream(ip) is None:
                     accepted += 1
+                else:
+                    rejected += 1
 
             # 15 connections from 15 different IPs (bypass per-IP limit)
             tasks = [try_connect(f"ip-{i}") for i in range(15)]
@@ -139,13 +161,7 @@ class TestStreamCounterAtomicity:
 
             async def try_connect():
                 nonlocal accepted
-                async with mod._ip_lock:
-                    if mod._ip_stream_count["same-ip"] >= _MAX_STREAMS_PER_IP:
-                        return
-                    if mod._global_stream_count >= _MAX_GLOBAL_STREAMS:
-                        return
-                    mod._ip_stream_count["same-ip"] += 1
-                    mod._global_stream_count += 1
+                if mod._acquire_stream("same-ip") is None:
                     accepted += 1
 
             tasks = [try_connect() for _ in range(5)]
@@ -172,23 +188,17 @@ class TestStreamCounterAtomicity:
 
             # Simulate 5 connections
             for i in range(5):
-                async with mod._ip_lock:
-                    mod._ip_stream_count[f"ip-{i}"] += 1
-                    mod._global_stream_count += 1
+                assert mod._acquire_stream(f"ip-{i}") is None
 
             assert mod._global_stream_count == 5
 
             # Simulate all disconnecting
             for i in range(5):
-                async with mod._ip_lock:
-                    mod._ip_stream_count[f"ip-{i}"] = max(
-                        0, mod._ip_stream_count[f"ip-{i}"] - 1
-                    )
-                    mod._global_stream_count = max(0, mod._global_stream_count - 1)
+                mod._release_stream(f"ip-{i}")
 
             assert mod._global_stream_count == 0
-            for i in range(5):
-                assert mod._ip_stream_count[f"ip-{i}"] == 0
+            # Zeroed IPs are dropped rather than kept around at 0
+            assert mod._ip_stream_count == {}
 
         finally:
             mod._ip_stream_count.clear()
@@ -0,0 +1,84 @@
+"""Unit tests for rawl.engine.flv_demuxer using synthetic FLV byte streams."""
+from __future__ import annotations
+
+import asyncio
+import struct
+
+import pytest
+
+from rawl.engine.flv_demuxer import (
+    ANNEX_B_START_CODE,
+    FLVDemuxError,
+    _avcc_to_annex_b,
+    _parse_sps_pps,
+    parse_flv_tags,
+)
+
+SPS = b"\x67\x42\x00\x1e"
+PPS = b"\x68\xce\x38\x80"
+
+
+def _video_tag(body: bytes, timestamp_ms: int = 0) -> bytes:
+    header = (
+        bytes([0x09])
+        + len(body).to_bytes(3, "big")
+        + (timestamp_ms & 0xFFFFFF).to_bytes(3, "big")
+        + bytes([(timestamp_ms >> 24) & 0xFF])
+        + b"\x00\x00\x00"
+    )
+    return header + body + struct.pack(">I", len(body) + 11)
+
+
+def _flv(*tags: bytes) -> bytes:
+    return b"FLV\x01\x01" + struct.pack(">I", 9) + b"\x00\x00\x00\x00" + b"".join(tags)
+
+
+async def _collect(data: bytes) -> list:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return [tag async for tag in parse_flv_tags(reader)]
+
+
+def _avc_record() -> bytes:
+    return (
+        b"\x01\x42\x00\x1e\xff\xe1"
+        + struct.pack(">H", len(SPS)) + SPS
+        + b"\x01" + struct.pack(">H", len(PPS)) + PPS
+    )
+
+
+class TestAvccToAnnexB:
+    def test_converts_length_prefixes(self):
+        body = struct.pack(">I", 3) + b"abc" + struct.pack(">I", 2) + b"de"
+        assert _avcc_to_annex_b(body) == ANNEX_B_START_CODE + b"abc" + ANNEX_B_START_CODE + b"de"
+
+    def test_overflow_raises(self):
+        with pytest.raises(FLVDemuxError):
+            _avcc_to_annex_b(struct.pack(">I", 10) + b"abc")
+
+
+class TestParseSpsPps:
+    def test_extracts_sps_and_pps(self):
+        assert _parse_sps_pps(_avc_record()) == ANNEX_B_START_CODE + SPS + ANNEX_B_START_CODE + PPS
+
+
+class TestParseFlvTags:
+    async def test_sequence_header_and_keyframe(self):
+        seq = _video_tag(b"\x17\x00\x00\x00\x00" + _avc_record())
+        nal = b"\x65\x88\x84"
+        key = _video_tag(b"\x17\x01\x00\x00\x00" + struct.pack(">I", len(nal)) + nal, 0x01000021)
+
+        tags = await _collect(_flv(seq, key))
+
+        assert len(tags) == 2
+        assert tags[0].is_sequence_header
+        assert tags[1].is_keyframe and not tags[1].is_sequence_header
+        assert tags[1].timestamp_ms == 0x01000021
+        assert tags[1].nal_data == ANNEX_B_START_CODE + nal
+
+    async def test_prev_tag_size_mismatch_raises(self):
+        bad = bytearray(_video_tag(b"\x27\x01\x00\x00\x00" + struct.pack(">I", 1) + b"\x41"))
+        bad[-1] ^= 0xFF
+        with pytest.raises(FLVDemuxError):
+            await _collect(_flv(bytes(bad)))
@@ -0,0 +1,85 @@
+"""Unit tests for rawl.evm.client helpers (no RPC)."""
+from __future__ import annotations
+
+import uuid
+from unittest.mock import AsyncMock
+
+from rawl.evm.client import EVMClient, checksum_address, match_id_to_bytes
+
+
+class TestMatchIdToBytes:
+    def test_pads_uuid_to_32_bytes(self):
+        mid = "12345678-1234-5678-1234-567812345678"
+        out = match_id_to_bytes(mid)
+        assert len(out) == 32
+        assert out[:16] == uuid.UUID(mid).bytes
+        assert out[16:] == b"\x00" * 16
+
+    def test_repeat_conversions_hit_cache(self):
+        match_id_to_bytes.cache_clear()
+        mid = str(uuid.uuid4())
+        assert match_id_to_bytes(mid) is match_id_to_bytes(mid)
+        assert match_id_to_bytes.cache_info().hits == 1
+
+
+class TestChecksumAddress:
+    def test_checksums_lowercase_address(self):
+        addr = "0x5aaeb6053f3e94c9b9a09f33669435e7ef1beaed"
+        assert checksum_address(addr) == "0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed"
+
+    def test_repeat_lookups_hit_cache(self):
+        checksum_address.cache_clear()
+        addr = "0xfb6916095ca1df60bb79ce92ce3ea74c37c5d359"
+        checksum_address(addr)
+        checksum_address(addr)
+        info = checksum_address.cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+
+def _batch_client() -> EVMClient:
+    client = EVMClient()
+    client._initialized = True
+    client._nonce = AsyncMock()
+    client._broadcast = AsyncMock(side_effect=lambda fn_call: f"hash-{fn_call}".encode())
+    client._confirm = AsyncMock(side_effect=lambda tx_hash, name: tx_hash.decode())
+    client._send_tx = AsyncMock(side_effect=lambda fn_call, name: f"resent-{fn_call}")
+    return client
+
+
+class TestSendTxBatch:
+    async def test_results_in_input_order(self):
+        client = _batch_client()
+        results = await client._send_tx_batch([("a", "timeout_match"), ("b", "timeout_match")])
+        assert results == ["hash-a", "hash-b"]
+        client._send_tx.assert_not_awaited()
+
+    async def test_broadcast_failure_falls_back_to_send_tx(self):
+        client = _batch_client()
+        client._broadcast.side_effect = [b"hash-a", ConnectionError("rpc down")]
+        results = await client._send_tx_batch([("a", "timeout_match"), ("b", "timeout_match")])
+        assert results == ["hash-a", "resent-b"]
+        client._nonce.rollback.assert_awaited_once()
+        client._send_tx.assert_awaited_once_with("b", "timeout_match")
+
+    async def test_confirm_timeout_resends_via_send_tx(self):
+        client = _batch_client()
+
+        async def confirm(tx_hash, name):
+            if tx_hash == b"hash-a":
+                raise TimeoutError("no receipt")
+            return tx_hash.decode()
+
+        client._confirm.side_effect = confirm
+        results = await client._send_tx_batch([("a", "timeout_match"), ("b", "timeout_match")])
+        assert results == ["resent-a", "hash-b"]
+        client._nonce.reset.assert_awaited_once()
+        client._send_tx.assert_awaited_once_with("a", "timeout_match")
+
+    async def test_revert_is_returned_not_resent(self):
+        client = _batch_client()
+        revert = RuntimeError("timeout_match reverted: already cancelled")
+        client._confirm.side_effect = [revert, "hash-b"]
+        results = await client._send_tx_batch([("a", "timeout_match"), ("b", "timeout_match")])
+        assert results == [revert, "hash-b"]
+        client._send_tx.assert_not_awaited()
@@ -0,0 +1,147 @@
+"""Unit tests for rawl.evm.event_listener log routing (no RPC)."""
+from __future__ import annotations
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from eth_abi import encode
+from web3 import Web3
+
+from rawl.evm.abi import CONTRACT_ABI
+from rawl.evm.event_listener import _EVENT_TOPICS, _HANDLED_EVENTS, EventListener
+
+_CONTRACT = "0x" + "11" * 20
+
+
+def _listener() -> EventListener:
+    listener = EventListener()
+    listener._contract = Web3().eth.contract(address=_CONTRACT, abi=CONTRACT_ABI)
+    listener._dispatch_event = AsyncMock()
+    return listener
+
+
+def _match_locked_log(match_id: bytes) -> dict:
+    topic = next(t for t, name in _EVENT_TOPICS.items() if name == "MatchLocked")
+    abi = next(a for a in CONTRACT_ABI if a.get("name") == "MatchLocked")
+    indexed = [i for i in abi["inputs"] if i["indexed"]]
+    data_inputs = [i for i in abi["inputs"] if not i["indexed"]]
+    values = {"matchId": match_id}
+    return {
+        "address": _CONTRACT,
+        "topics": [topic] + [encode([i["type"]], [values.get(i["name"], 0)]) for i in indexed],
+        "data": encode([i["type"] for i in data_inputs], [values.get(i["name"], 0) for i in data_inputs]),
+        "blockNumber": 1,
+        "blockHash": b"\x00" * 32,
+        "transactionHash": b"\x00" * 32,
+        "transactionIndex": 0,
+        "logIndex": 0,
+    }
+
+
+class TestEventTopics:
+    def test_all_handled_events_have_topics(self):
+        assert sorted(_EVENT_TOPICS.values()) == sorted(_HANDLED_EVENTS)
+
+
+class TestHandleLog:
+    async def test_routes_by_topic(self):
+        listener = _listener()
+        match_id = uuid.uuid4().bytes.ljust(32, b"\x00")
+        await listener._handle_log(_match_locked_log(match_id))
+        listener._dispatch_event.assert_awaited_once()
+        name, args = listener._dispatch_event.await_args.args
+        assert name == "MatchLocked"
+        assert args["matchId"] == match_id
+
+    async def test_unknown_topic_ignored(self):
+        listener = _listener()
+        await listener._handle_log({"topics": [b"\xff" * 32], "data": b""})
+        listener._dispatch_event.assert_not_awaited()
+
+    async def test_no_topics_ignored(self):
+        listener = _listener()
+        await listener._handle_log({"topics": [], "data": b""})
+        listener._dispatch_event.assert_not_awaited()
+
+
+class TestDispatchEvent:
+    def test_every_handled_event_has_handler(self):
+        assert set(EventListener()._handlers) == set(_HANDLED_EVENTS)
+
+    async def test_routes_to_handler_with_uuid(self):
+        listener = EventListener()
+        handler = AsyncMock()
+        listener._handlers["MatchLocked"] = handler
+        match_id = uuid.uuid4()
+        args = {"matchId": match_id.bytes.ljust(32, b"\x00")}
+        await listener._dispatch_event("MatchLocked", args)
+        handler.assert_awaited_once_with(args, str(match_id))
+
+    async def test_unknown_event_ignored(self):
+        listener = EventListener()
+        for name in listener._handlers:
+            listener._handlers[name] = AsyncMock()
+        session_factory = MagicMock()
+        with patch("rawl.db.session.worker_session_factory", session_factory):
+            await listener._dispatch_event("Unknown", {"matchId": b"\x00" * 32})
+        for handler in listener._handlers.values():
+            handler.assert_not_awaited()
+        session_factory.assert_not_called()
+
+
+class TestBytes32ToUuid:
+    def test_round_trips_padded_match_id(self):
+        match_id = uuid.uuid4()
+        assert EventListener._bytes32_to_uuid(match_id.bytes.ljust(32, b"\x00")) == str(match_id)
+
+    def test_short_input_returns_none(self):
+        assert EventListener._bytes32_to_uuid(b"\x01" * 8) is None
+        assert EventListener._bytes32_to_uuid(b"") is None
+
+
+# Handlers are passed UUID objects here: SQLite's Uuid bind needs them, while
+# asyncpg also accepts the string form the listener produces.
+class TestStatusHandlers:
+    async def test_match_locked_updates_row(self, db_session, session_factory, seed_matches):
+        match = seed_matches[0]
+        with patch("rawl.db.session.worker_session_factory", session_factory):
+            await EventListener()._handle_match_locked({}, match.id)
+        await db_session.refresh(match)
+        assert match.status == "locked"
+        assert match.locked_at is not None
+
+    async def test_match_resolved_sets_totals(self, db_session, session_factory, seed_matches):
+        match = seed_matches[1]
+        args = {"winner": 0, "sideATotal": 2 * 10**18, "sideBTotal": 10**18}
+        with patch("rawl.db.session.worker_session_factory", session_factory):
+            await EventListener()._handle_match_resolved(args, match.id)
+        await db_session.refresh(match)
+        assert match.status == "resolved"
+        assert match.side_a_total == 2.0
+        assert match.side_b_total == 1.0
+
+    async def test_match_resolved_totals_round_exactly(self, db_session, session_factory, seed_matches):
+        match = seed_matches[1]
+        args = {"winner": 1, "sideATotal": 150_000_000_000_000, "sideBTotal": 3 * 10**17}
+        with patch("rawl.db.session.worker_session_factory", session_factory):
+            await EventListener()._handle_match_resolved(args, match.id)
+        await db_session.refresh(match)
+        assert match.side_a_total == 0.00015
+        assert match.side_b_total == 0.3
+
+    async def test_payout_claimed_updates_bet(self, db_session, session_factory, seed_bets):
+        bet = seed_bets[0]
+        bet.wallet_address = bet.wallet_address.lower()  # stored lowercase by the listener
+        await db_session.flush()
+        args = {"bettor": bet.wallet_address.upper().replace("0X", "0x")}
+        with patch("rawl.db.session.worker_session_factory", session_factory):
+            await EventListener()._handle_payout_claimed(args, bet.match_id)
+        await db_session.refresh(bet)
+        assert bet.status == "claimed"
+
+    async def test_unknown_match_is_noop(self, db_session, session_factory, seed_matches):
+        with patch("rawl.db.session.worker_session_factory", session_factory):
+            await EventListener()._handle_match_cancelled({}, uuid.uuid4())
+        for match in seed_matches:
+            await db_session.refresh(match)
+        assert [m.status for m in seed_matches] == ["open", "locked", "resolved"]
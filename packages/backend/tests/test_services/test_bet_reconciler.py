@@ -0,0 +1,59 @@
+"""Integration tests for rawl.services.bet_reconciler stale match timeouts."""
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+from rawl.db.models.match import Match
+from rawl.services.bet_reconciler import LOCK_TIMEOUT_SECONDS, _timeout_stale_matches_async
+
+
+async def _stale_matches(db_session, seed_fighters, count: int) -> list[Match]:
+    fa, _fv, fb, _fk = seed_fighters
+    locked_at = datetime.now(UTC) - timedelta(seconds=LOCK_TIMEOUT_SECONDS * 2)
+    matches = [
+        Match(
+            game_id="sf2ce", match_format=3, fighter_a_id=fa.id, fighter_b_id=fb.id,
+            status="locked", match_type="ranked", locked_at=locked_at,
+        )
+        for _ in range(count)
+    ]
+    db_session.add_all(matches)
+    await db_session.flush()
+    return matches
+
+
+class TestTimeoutStaleMatches:
+    async def test_cancels_only_matches_whose_tx_succeeded(
+        self, db_session, session_factory, seed_fighters, mock_evm
+    ):
+        ok, failed = await _stale_matches(db_session, seed_fighters, 2)
+
+        async def timeout_on_chain(match_ids):
+            return [
+                "0xok" if mid == str(ok.id) else RuntimeError("timeout_match reverted")
+                for mid in match_ids
+            ]
+
+        mock_evm.timeout_matches_on_chain = AsyncMock(side_effect=timeout_on_chain)
+        with (
+            patch("rawl.db.session.worker_session_factory", session_factory),
+            patch("rawl.services.bet_reconciler.logger") as logger,
+        ):
+            await _timeout_stale_matches_async()
+
+        submitted = mock_evm.timeout_matches_on_chain.await_args.args[0]
+        assert sorted(submitted) == sorted([str(ok.id), str(failed.id)])
+        await db_session.refresh(ok)
+        await db_session.refresh(failed)
+        assert ok.status == "cancelled"
+        assert ok.cancel_reason == "timeout"
+        assert failed.status == "locked"
+        logger.exception.assert_called_once()
+        assert logger.exception.call_args.kwargs["extra"] == {"match_id": str(failed.id)}
+
+    async def test_no_stale_matches_skips_chain(self, session_factory, seed_matches, mock_evm):
+        mock_evm.timeout_matches_on_chain = AsyncMock()
+        with patch("rawl.db.session.worker_session_factory", session_factory):
+            await _timeout_stale_matches_async()
+        mock_evm.timeout_matches_on_chain.assert_not_awaited()
@@ -13,6 +13,8 @@ from rawl.services.match_queue import (
     widen_windows,
 )
 
+pytestmark = pytest.mark.usefixtures("mock_redis")
+
 
 class TestEnqueueDequeue:
     async def test_enqueue_and_dequeue(self):
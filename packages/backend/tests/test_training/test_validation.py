@@ -0,0 +1,231 @@
+"""Unit tests for rawl.training.validation helpers (no SB3 or Docker)."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from rawl.training import validation
+from rawl.training.validation import (
+    _check_action_space,
+    _docker_client,
+    _measure_latency,
+    _obs_buffer,
+    _p99,
+    _run_sandbox,
+)
+
+
+class _FakeSpace:
+    def __init__(self, dtype):
+        self.dtype = np.dtype(dtype)
+
+
+class _FakeModel:
+    def __init__(self, action, action_space=None):
+        self.action = action
+        self.action_space = action_space
+        self.observations: list[np.ndarray] = []
+
+    def predict(self, obs, deterministic=True):
+        self.observations.append(obs.copy())
+        return self.action, None
+
+    def save(self, path):
+        path.write(b"PK-model")
+
+
+class TestCheckActionSpace:
+    def test_discrete_actions_pass(self):
+        model = _FakeModel(np.array([3]))
+        _check_action_space(model, _obs_buffer((4, 8, 8)), frames=5)
+        assert len(model.observations) == 1
+        assert model.observations[0].shape == (5, 4, 8, 8)
+        assert model.observations[0].dtype == np.uint8
+
+    def test_frames_split_into_batches(self):
+        model = _FakeModel(np.array([0]))
+        _check_action_space(model, _obs_buffer((8, 8), batch_size=3), frames=7)
+        assert [obs.shape[0] for obs in model.observations] == [3, 3, 1]
+
+    def test_observations_vary_between_batches(self):
+        model = _FakeModel(np.array([0]))
+        _check_action_space(model, _obs_buffer((16, 16), batch_size=1), frames=2)
+        assert not np.array_equal(model.observations[0], model.observations[1])
+
+    def test_nan_float_action_rejected(self):
+        model = _FakeModel(np.array([0.5, np.nan], dtype=np.float32), _FakeSpace(np.float32))
+        with pytest.raises(ValueError):
+            _check_action_space(model, _obs_buffer((8, 8)), frames=3)
+
+    def test_discrete_space_skips_finite_check(self):
+        # A discrete space never yields floats; the check isn't even attempted
+        model = _FakeModel(np.array([np.nan]), _FakeSpace(np.int64))
+        _check_action_space(model, _obs_buffer((8, 8)), frames=3)
+
+
+class TestMeasureLatency:
+    def test_returns_one_sample_per_step(self):
+        model = _FakeModel(np.array([0]))
+        latencies = _measure_latency(model, np.zeros((8, 8), dtype=np.uint8), steps=10)
+        assert latencies.shape == (10,)
+        assert (latencies >= 0).all()
+
+    def test_warmup_calls_are_not_timed(self):
+        model = _FakeModel(np.array([0]))
+        latencies = _measure_latency(model, np.zeros((8, 8), dtype=np.uint8), steps=4, warmup=3)
+        assert len(model.observations) == 7
+        assert latencies.shape == (4,)
+
+    def test_reuses_buffer_filled_by_action_space_check(self):
+        batch = _obs_buffer((8, 8))
+        _check_action_space(_FakeModel(np.array([0])), batch, frames=3)
+        model = _FakeModel(np.array([0]))
+        _measure_latency(model, batch[0], steps=2, warmup=0)
+        assert np.array_equal(model.observations[0], batch[0])
+
+
+class TestP99:
+    def test_matches_sorted_index(self):
+        latencies = np.random.default_rng(0).random(100)
+        assert _p99(latencies) == sorted(latencies)[99]
+
+    def test_does_not_reorder_input(self):
+        latencies = np.array([5.0, 1.0, 3.0])
+        _p99(latencies)
+        assert latencies.tolist() == [5.0, 1.0, 3.0]
+
+
+class _FakeSocket:
+    def __init__(self, send_error=None):
+        self.send_error = send_error
+        self.sent = b""
+        self.closed = False
+        self._sock = self
+
+    def sendall(self, data):
+        if self.send_error:
+            raise self.send_error
+        self.sent += data
+
+    def shutdown(self, how):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeContainer:
+    def __init__(self, sock, exit_code=0, wait_error=None):
+        self.sock = sock
+        self.exit_code = exit_code
+        self.wait_error = wait_error
+        self.removed = False
+
+    def attach_socket(self, params):
+        return self.sock
+
+    def start(self):
+        pass
+
+    def wait(self, timeout):
+        if self.wait_error:
+            raise self.wait_error
+        return {"StatusCode": self.exit_code}
+
+    def remove(self, force):
+        self.removed = True
+
+
+class _FakeDockerClient:
+    def __init__(self, container, create_error=None):
+        self.container = container
+        self.create_error = create_error
+        self.containers = self
+
+    def create(self, image, **kwargs):
+        if self.create_error:
+            raise self.create_error
+        return self.container
+
+
+class TestRunSandbox:
+    @pytest.fixture
+    def docker_client(self):
+        def install(container):
+            client = _FakeDockerClient(container)
+            return patch("rawl.training.validation._docker_client", return_value=client)
+
+        return install
+
+    async def test_streams_saved_model_and_passes_on_zero_exit(self, docker_client):
+        container = _FakeContainer(_FakeSocket())
+        with docker_client(container):
+            assert await _run_sandbox(_FakeModel(None), "f1") is True
+        assert container.sock.sent == b"PK-model"
+        assert container.sock.closed
+        assert container.removed
+
+    async def test_nonzero_exit_fails(self, docker_client):
+        with docker_client(_FakeContainer(_FakeSocket(), exit_code=1)):
+            assert await _run_sandbox(_FakeModel(None), "f1") is False
+
+    async def test_wait_timeout_fails(self, docker_client):
+        container = _FakeContainer(_FakeSocket(), wait_error=TimeoutError("read timed out"))
+        with docker_client(container):
+            assert await _run_sandbox(_FakeModel(None), "f1") is False
+        assert container.removed
+
+    async def test_container_exiting_before_stdin_fails(self, docker_client):
+        container = _FakeContainer(_FakeSocket(send_error=BrokenPipeError()))
+        with docker_client(container):
+            assert await _run_sandbox(_FakeModel(None), "f1") is False
+        assert container.sock.closed
+        assert container.removed
+
+    async def test_missing_image_skips(self):
+        # Stands in for docker.errors.ImageNotFound from containers.create
+        client = _FakeDockerClient(None, create_error=LookupError("No such image"))
+        with (
+            patch("rawl.training.validation._docker_client", return_value=client),
+            patch("rawl.training.validation._sandbox_load") as load,
+        ):
+            assert await _run_sandbox(_FakeModel(None), "f1") is True
+        load.assert_not_called()
+
+    async def test_docker_unavailable_skips(self):
+        with (
+            patch("rawl.training.validation._docker_client", side_effect=OSError("no docker")),
+            patch("rawl.training.validation._sandbox_load") as load,
+        ):
+            assert await _run_sandbox(_FakeModel(None), "f1") is True
+        load.assert_not_called()
+
+
+class TestDockerClient:
+    @pytest.fixture(autouse=True)
+    def _reset_client(self, monkeypatch):
+        monkeypatch.setattr(validation, "_docker", None)
+        monkeypatch.setattr(validation, "_docker_retry_at", 0.0)
+
+    def test_client_created_once(self):
+        calls = []
+
+        def from_env():
+            calls.append(1)
+            return MagicMock()
+
+        with patch.dict("sys.modules", {"docker": SimpleNamespace(from_env=from_env)}):
+            first = _docker_client()
+            assert _docker_client() is first
+        assert len(calls) == 1
+
+    def test_connect_failure_is_remembered(self, monkeypatch):
+        with patch.dict("sys.modules", {"docker": None}), pytest.raises(ImportError):
+            _docker_client()
+        assert validation._docker_retry_at > 0
+        # Second call short-circuits without retrying the import
+        with pytest.raises(RuntimeError, match="cached"):
+            _docker_client()
@@ -0,0 +1,447 @@
+"""Tests for the per-match fan-out pumps in the WebSocket broadcaster."""
+from __future__ import annotations
+
+import asyncio
+import json
+import struct
+from unittest.mock import patch
+
+import pytest
+
+from rawl.ws import broadcaster
+from rawl.ws.broadcaster import (
+    _EOS_FRAME,
+    _SUBSCRIBER_QUEUE_SIZE,
+    TYPE_BATCH,
+    TYPE_DELTA,
+    TYPE_KEYFRAME,
+    TYPE_SEQ_HEADER,
+    _attach,
+    _build_batch,
+    _build_ws_frame,
+    _detach,
+    _pumps,
+    _release,
+    _run_data_pump,
+    _run_video_pump,
+    _Subscriber,
+    _try_reserve,
+    video_channel,
+)
+
+MATCH_ID = "00000000-0000-0000-0000-000000000001"
+
+
+class _FakeStreams:
+    """Serves scripted XREAD batches, then blocks like an idle stream."""
+
+    def __init__(
+        self,
+        batches: list[list[tuple[bytes, dict]]],
+        sps_pps: bytes | None = None,
+        gop: list[tuple[bytes, dict]] | None = None,
+    ) -> None:
+        self._batches = list(batches)
+        self._sps_pps = sps_pps
+        self._gop = gop or []
+        self.reads = 0
+        self.read_from: list = []
+        self.closed = 0
+
+    def dedicated(self):
+        return self
+
+    async def close(self):
+        self.closed += 1
+
+    async def mget(self, sps_pps_key, keyframe_key):
+        return [self._sps_pps, self._gop[0][0] if self._gop else None]
+
+    async def stream_range(self, stream, start="-", end="+", count=None):
+        assert start == self._gop[0][0].decode()
+        return list(self._gop)
+
+    async def stream_read(self, stream, last_id="0", count=10, block=1000):
+        self.reads += 1
+        self.read_from.append(last_id)
+        if self._batches:
+            return [(stream.encode(), self._batches.pop(0))]
+        await asyncio.Event().wait()
+        return []
+
+
+class _FakeWebSocket:
+    """Records sent frames; receive() blocks like a connected, silent client."""
+
+    headers: dict[str, str] = {}
+    client = None
+
+    def __init__(self) -> None:
+        self.sent: list[bytes] = []
+        self.closed: tuple[int, str] | None = None
+
+    async def accept(self) -> None:
+        return None
+
+    async def receive(self) -> dict:
+        await asyncio.Event().wait()
+        return {}
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        self.closed = (code, reason)
+
+
+def _split_batch(message: bytes) -> list[bytes]:
+    assert message[0] == TYPE_BATCH
+    frames, offset = [], 1
+    while offset < len(message):
+        (length,) = struct.unpack_from(">I", message, offset)
+        offset += 4
+        frames.append(message[offset : offset + length])
+        offset += length
+    return frames
+
+
+@pytest.fixture(autouse=True)
+async def _clear_pumps():
+    yield
+    tasks = [pump.task for pump in _pumps.values() if pump.task is not None]
+    _pumps.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _idle(pump) -> None:
+    await asyncio.Event().wait()
+
+
+class TestAttachDetach:
+    async def test_one_pump_per_stream(self):
+        pump_a, sub_a = _attach(MATCH_ID, "s", _idle)
+        pump_b, sub_b = _attach(MATCH_ID, "s", _idle)
+        assert pump_a is pump_b
+        assert pump_a.subscribers == {sub_a, sub_b}
+
+    async def test_last_detach_cancels_pump(self):
+        pump, sub_a = _attach(MATCH_ID, "s", _idle)
+        _, sub_b = _attach(MATCH_ID, "s", _idle)
+
+        _detach(pump, sub_a)
+        assert "s" in _pumps
+
+        _detach(pump, sub_b)
+        assert "s" not in _pumps
+        await asyncio.sleep(0)
+        assert pump.task.cancelled()
+
+    async def test_finished_pump_is_replaced(self):
+        async def _done(pump) -> None:
+            return
+
+        pump, sub = _attach(MATCH_ID, "s", _done)
+        await pump.task
+        await asyncio.sleep(0)
+        assert "s" not in _pumps
+
+        fresh, _ = _attach(MATCH_ID, "s", _idle)
+        assert fresh is not pump
+        _detach(pump, sub)
+        assert _pumps["s"] is fresh
+
+
+class TestPumpReader:
+    async def test_detach_closes_dedicated_reader(self):
+        fake = _FakeStreams([])
+        with patch.object(broadcaster, "redis_pool", fake):
+            pump, sub = _attach(MATCH_ID, "d", _run_data_pump)
+            while not fake.reads:
+                await asyncio.sleep(0)
+            _detach(pump, sub)
+            await asyncio.gather(pump.task, return_exceptions=True)
+
+        assert fake.closed == 1
+
+
+class TestSubscriber:
+    async def test_offer_drops_when_full(self):
+        sub = _Subscriber()
+        for i in range(_SUBSCRIBER_QUEUE_SIZE + 5):
+            sub.offer(i)
+        assert sub.queue.qsize() == _SUBSCRIBER_QUEUE_SIZE
+        assert sub.dropped == 5
+
+    async def test_push_evicts_oldest(self):
+        sub = _Subscriber()
+        for i in range(_SUBSCRIBER_QUEUE_SIZE):
+            sub.offer(i)
+        sub.push(None)
+        assert sub.queue.get_nowait() == 1
+        items = [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+        assert items[-1] is None
+
+
+class TestOfferVideo:
+    def test_keyframe_supersedes_full_backlog(self):
+        sub = _Subscriber(queue_size=3)
+        for frame in (b"k", b"d1", b"d2"):
+            sub.offer_video(frame, anchor=frame == b"k")
+        sub.offer_video(b"k2", anchor=True)
+        assert [sub.queue.get_nowait() for _ in range(sub.queue.qsize())] == [b"k2"]
+        assert sub.dropped == 3
+
+    def test_deltas_skipped_until_next_keyframe(self):
+        sub = _Subscriber(queue_size=2)
+        sub.offer_video(b"k", anchor=True)
+        sub.offer_video(b"d1", anchor=False)
+        sub.offer_video(b"d2", anchor=False)  # dropped: queue full
+        sub.queue.get_nowait()  # viewer catches up
+        sub.offer_video(b"d3", anchor=False)  # undecodable after d2 was lost
+        assert sub.resync
+        sub.offer_video(b"k2", anchor=True)
+        assert [sub.queue.get_nowait() for _ in range(sub.queue.qsize())] == [b"d1", b"k2"]
+        assert not sub.resync
+        assert sub.dropped == 2
+
+    def test_disconnect_wakeup_survives_keyframe(self):
+        sub = _Subscriber(queue_size=2)
+        sub.offer_video(b"k", anchor=True)
+        sub.close()
+        sub.offer_video(b"k2", anchor=True)
+        assert None in [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+
+
+class TestVideoPump:
+    async def test_reads_once_for_all_subscribers(self):
+        fake = _FakeStreams([
+            [
+                (b"1-0", {b"type": b"key", b"nal": b"K", b"ts": b"10", b"seq": b"1"}),
+                (b"1-1", {b"type": b"delta", b"nal": b"D", b"ts": b"20", b"seq": b"2"}),
+            ],
+            [(b"1-2", {b"type": b"eos"})],
+        ])
+        with patch.object(broadcaster, "redis_pool", fake):
+            pump, sub_a = _attach(MATCH_ID, "v", _run_video_pump)
+            _, sub_b = _attach(MATCH_ID, "v", _run_video_pump)
+            await asyncio.wait_for(pump.task, timeout=1)
+
+        expected = [
+            _build_ws_frame(TYPE_KEYFRAME, 10, 1, b"K"),
+            _build_ws_frame(TYPE_DELTA, 20, 2, b"D"),
+            _EOS_FRAME,
+        ]
+        for sub in (sub_a, sub_b):
+            got = [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+            assert got == expected
+        assert fake.reads == 2
+
+    async def test_packed_header_spliced_into_frame(self):
+        hdr = struct.pack(">QI", 123456789, 42)
+        fake = _FakeStreams([
+            [(b"1-0", {b"type": b"key", b"nal": b"K", b"hdr": hdr})],
+            [(b"1-1", {b"type": b"eos"})],
+        ])
+        with patch.object(broadcaster, "redis_pool", fake):
+            pump, sub = _attach(MATCH_ID, "v", _run_video_pump)
+            await asyncio.wait_for(pump.task, timeout=1)
+
+        assert sub.queue.get_nowait() == _build_ws_frame(TYPE_KEYFRAME, 123456789, 42, b"K")
+
+    async def test_first_viewer_starts_at_stored_keyframe(self):
+        fake = _FakeStreams(
+            [[(b"7-0", {b"type": b"eos"})]],
+            sps_pps=b"SPS",
+            gop=[
+                (b"5-0", {b"type": b"key", b"nal": b"K", b"ts": b"1", b"seq": b"1"}),
+                (b"6-0", {b"type": b"delta", b"nal": b"D", b"ts": b"2", b"seq": b"2"}),
+            ],
+        )
+        with patch.object(broadcaster, "redis_pool", fake):
+            pump, sub = _attach(MATCH_ID, "v", _run_video_pump)
+            await asyncio.wait_for(pump.task, timeout=1)
+
+        got = [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+        assert got == [
+            _build_ws_frame(TYPE_SEQ_HEADER, 0, 0, b"SPS"),
+            _build_ws_frame(TYPE_KEYFRAME, 1, 1, b"K"),
+            _build_ws_frame(TYPE_DELTA, 2, 2, b"D"),
+            _EOS_FRAME,
+        ]
+        # Live reads continue after the replayed GOP
+        assert fake.read_from == [b"6-0"]
+
+    async def test_lagging_batch_skips_to_latest_keyframe(self):
+        def _nal(kind: bytes, n: int) -> tuple[bytes, dict]:
+            data = {b"type": kind, b"nal": b"N", b"ts": b"0", b"seq": str(n).encode()}
+            return (f"1-{n}".encode(), data)
+
+        fake = _FakeStreams([
+            [
+                _nal(b"delta", 0),
+                _nal(b"key", 1),
+                _nal(b"delta", 2),
+                _nal(b"key", 3),
+                _nal(b"delta", 4),
+            ],
+            [(b"1-5", {b"type": b"eos"})],
+        ])
+        with patch.object(broadcaster, "redis_pool", fake):
+            pump, sub = _attach(MATCH_ID, "v", _run_video_pump)
+            await asyncio.wait_for(pump.task, timeout=1)
+
+        got = [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+        assert got == [
+            _build_ws_frame(TYPE_KEYFRAME, 0, 3, b"N"),
+            _build_ws_frame(TYPE_DELTA, 0, 4, b"N"),
+            _EOS_FRAME,
+        ]
+
+    async def test_malformed_entry_ends_every_viewer_stream(self):
+        fake = _FakeStreams([[(b"1-0", {b"type": b"key", b"nal": b"K", b"ts": b"bad"})]])
+        with patch.object(broadcaster, "redis_pool", fake):
+            pump, sub_a = _attach(MATCH_ID, "v", _run_video_pump)
+            _, sub_b = _attach(MATCH_ID, "v", _run_video_pump)
+            await asyncio.wait_for(pump.task, timeout=1)
+
+        for sub in (sub_a, sub_b):
+            assert sub.queue.get_nowait() is _EOS_FRAME
+        assert fake.closed == 1
+
+    async def test_gop_cached_for_late_joiners(self):
+        fake = _FakeStreams([
+            [(b"1-0", {b"type": b"delta", b"nal": b"X", b"ts": b"1", b"seq": b"1"})],
+            [(b"1-1", {b"type": b"key", b"nal": b"K", b"ts": b"2", b"seq": b"2"})],
+            [(b"1-2", {b"type": b"delta", b"nal": b"D", b"ts": b"3", b"seq": b"3"})],
+        ])
+        with patch.object(broadcaster, "redis_pool", fake):
+            pump, _ = _attach(MATCH_ID, "v", _run_video_pump)
+            for _ in range(10):
+                await asyncio.sleep(0)
+
+        assert pump.gop == [
+            _build_ws_frame(TYPE_KEYFRAME, 2, 2, b"K"),
+            _build_ws_frame(TYPE_DELTA, 3, 3, b"D"),
+        ]
+
+
+class TestDataPump:
+    async def test_fans_out_data_messages(self):
+        fake = _FakeStreams([[(b"1-0", {b"p1_health": b"0.5", b"status": b"live"})]])
+        with patch.object(broadcaster, "redis_pool", fake):
+            _, sub_a = _attach(MATCH_ID, "d", _run_data_pump)
+            _, sub_b = _attach(MATCH_ID, "d", _run_data_pump)
+            msg_a = await asyncio.wait_for(sub_a.queue.get(), timeout=1)
+            msg_b = await asyncio.wait_for(sub_b.queue.get(), timeout=1)
+
+        # Encoded once in the pump, shared by every subscriber
+        assert msg_a is msg_b
+        assert json.loads(msg_a)["health_a"] == 0.5
+        assert fake.reads >= 1
+
+
+    async def test_failed_pump_wakes_viewers(self):
+        fake = _FakeStreams([[(b"1-0", {b"status": b"live"})]])
+        with (
+            patch.object(broadcaster, "redis_pool", fake),
+            patch.object(broadcaster, "_build_data_message", side_effect=ValueError("bad")),
+        ):
+            pump, sub = _attach(MATCH_ID, "d", _run_data_pump)
+            await asyncio.wait_for(pump.task, timeout=1)
+
+        assert sub.queue.get_nowait() is None
+        assert fake.closed == 1
+
+class TestVideoBatching:
+    def test_batch_round_trip(self):
+        frames = [_build_ws_frame(TYPE_DELTA, i, i, b"x" * i) for i in range(1, 4)]
+        assert _split_batch(_build_batch(frames)) == frames
+
+    async def test_backlog_sent_as_one_message_then_eos(self):
+        frames = [
+            (b"1-0", {b"type": b"key", b"nal": b"K", b"ts": b"1", b"seq": b"1"}),
+            (b"1-1", {b"type": b"delta", b"nal": b"D1", b"ts": b"2", b"seq": b"2"}),
+            (b"1-2", {b"type": b"delta", b"nal": b"D2", b"ts": b"3", b"seq": b"3"}),
+        ]
+        fake = _FakeStreams([frames, [(b"1-3", {b"type": b"eos"})]])
+        ws = _FakeWebSocket()
+        with patch.object(broadcaster, "redis_pool", fake):
+            await asyncio.wait_for(video_channel(ws, MATCH_ID), timeout=1)
+
+        assert len(ws.sent) == 2
+        assert _split_batch(ws.sent[0]) == [
+            _build_ws_frame(TYPE_KEYFRAME, 1, 1, b"K"),
+            _build_ws_frame(TYPE_DELTA, 2, 2, b"D1"),
+            _build_ws_frame(TYPE_DELTA, 3, 3, b"D2"),
+        ]
+        assert ws.sent[1] is _EOS_FRAME
+        assert ws.closed == (1000, "Stream ended")
+        assert not _pumps
+        assert MATCH_ID not in broadcaster._video_connections
+        assert not broadcaster._ip_video_count
+
+    async def test_first_viewer_primed_with_header_and_full_gop(self, monkeypatch):
+        monkeypatch.setattr(broadcaster.settings, "h264_keyframe_interval", 4)
+        gop = [(b"5-0", {b"type": b"key", b"nal": b"K", b"ts": b"1", b"seq": b"1"})] + [
+            (f"5-{i}".encode(), {b"type": b"delta", b"nal": b"D", b"ts": b"1", b"seq": b"1"})
+            for i in range(1, 4)
+        ]
+        fake = _FakeStreams([], sps_pps=b"SPS", gop=gop)
+        ws = _FakeWebSocket()
+        with patch.object(broadcaster, "redis_pool", fake):
+            task = asyncio.create_task(video_channel(ws, MATCH_ID))
+            for _ in range(10):
+                await asyncio.sleep(0)
+            (sub,) = _pumps[f"match:{MATCH_ID}:video"].subscribers
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        assert sub.dropped == 0
+        assert not sub.resync
+        sent = [f for msg in ws.sent for f in (_split_batch(msg) if msg[0] == TYPE_BATCH else [msg])]
+        assert sent == [
+            _build_ws_frame(TYPE_SEQ_HEADER, 0, 0, b"SPS"),
+            _build_ws_frame(TYPE_KEYFRAME, 1, 1, b"K"),
+            *[_build_ws_frame(TYPE_DELTA, 1, 1, b"D")] * 3,
+        ]
+
+
+    async def test_late_joiner_without_gop_waits_for_keyframe(self):
+        # A running pump that has not seen a keyframe yet
+        pump, _ = _attach(MATCH_ID, f"match:{MATCH_ID}:video", _idle)
+        ws = _FakeWebSocket()
+        task = asyncio.create_task(video_channel(ws, MATCH_ID))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        pump.publish_video(_build_ws_frame(TYPE_DELTA, 2, 2, b"D"), anchor=False)
+        pump.publish_video(_build_ws_frame(TYPE_KEYFRAME, 3, 3, b"K"), anchor=True)
+        for _ in range(5):
+            await asyncio.sleep(0)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert ws.sent == [_build_ws_frame(TYPE_KEYFRAME, 3, 3, b"K")]
+
+class TestConnectionLimits:
+    def test_reserve_up_to_limit(self):
+        counts: dict[str, int] = {}
+        assert _try_reserve(counts, "1.2.3.4", 2)
+        assert _try_reserve(counts, "1.2.3.4", 2)
+        assert not _try_reserve(counts, "1.2.3.4", 2)
+        assert counts == {"1.2.3.4": 2}
+
+    def test_release_drops_ip_at_zero(self):
+        counts: dict[str, int] = {}
+        _try_reserve(counts, "1.2.3.4", 2)
+        _try_reserve(counts, "1.2.3.4", 2)
+        _release(counts, "1.2.3.4")
+        assert counts == {"1.2.3.4": 1}
+        _release(counts, "1.2.3.4")
+        assert counts == {}
+
+    def test_rejected_ip_is_not_recorded(self):
+        counts: dict[str, int] = {}
+        assert not _try_reserve(counts, "1.2.3.4", 0)
+        assert counts == {}
@@ -13,6 +13,7 @@ const TYPE_SEQ_HEADER = 0x01;
 const TYPE_KEYFRAME = 0x02;
 const TYPE_DELTA = 0x03;
 const TYPE_EOS = 0x04;
+const TYPE_BATCH = 0x05;
 const HEADER_SIZE = 13;
 
 export function useLiveStream(
@@ -82,14 +83,12 @@ export function useLiveStream(
     };
   }, [isLive, webCodecsSupported, canvasRef]);
 
-  // Video WS message handler
-  const onVideoMessage = useCallback(
-    (event: MessageEvent) => {
-      if (!(event.data instanceof ArrayBuffer)) return;
-      const buf = event.data;
-      if (buf.byteLength < HEADER_SIZE) return;
+  // Decode one protocol frame located at [offset, offset + length) of buf
+  const handleVideoFrame = useCallback(
+    (buf: ArrayBuffer, offset: number, length: number) => {
+      if (length < HEADER_SIZE) return;
 
-      const view = new DataView(buf);
+      const view = new DataView(buf, offset, length);
       const type = view.getUint8(0);
       const timestampUs = Number(view.getBigUint64(1)); // microseconds since match start
       // const seq = view.getUint32(9);
@@ -102,7 +101,7 @@ export function useLiveStream(
       const decoder = decoderRef.current;
       if (!decoder || decoder.state === "closed") return;
 
-      const nalData = new Uint8Array(buf, HEADER_SIZE);
+      const nalData = new Uint8Array(buf, offset + HEADER_SIZE, length - HEADER_SIZE);
 
       // Buffer SPS+PPS sequence header — don't feed to decoder standalone.
       // Per W3C spec, Annex B key chunks must contain "both a primary coded picture
@@ -141,6 +140,32 @@ export function useLiveStream(
     [],
   );
 
+  // Video WS message handler
+  const onVideoMessage = useCallback(
+    (event: MessageEvent) => {
+      if (!(event.data instanceof ArrayBuffer)) return;
+      const buf = event.data;
+      if (buf.byteLength === 0) return;
+
+      const view = new DataView(buf);
+      if (view.getUint8(0) === TYPE_BATCH) {
+        // Backlog coalesced by the server: type(1) then [length u32 BE][frame]...
+        let offset = 1;
+        while (offset + 4 <= buf.byteLength) {
+          const length = view.getUint32(offset);
+          offset += 4;
+          if (offset + length > buf.byteLength) break;
+          handleVideoFrame(buf, offset, length);
+          offset += length;
+        }
+        return;
+      }
+
+      handleVideoFrame(buf, 0, buf.byteLength);
+    },
+    [handleVideoFrame],
+  );
+
   // Data WS message handler
   const onDataMessage = useCallback(
     (event: MessageEvent) => {
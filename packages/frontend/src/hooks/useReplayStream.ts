@@ -8,6 +8,11 @@ const WS_BASE = (process.env.NEXT_PUBLIC_API_URL || "http://localhost:8080/api")
   .replace(/\/api\/?$/, "")
   .replace("http", "ws");
 
+// Binary message carrying a frame and its data tick: [type:u8][jpeg_len:u32 BE][jpeg][JSON].
+// Bare JPEG frames always start with 0xFF.
+const TYPE_FRAME_DATA = 0x01;
+const textDecoder = new TextDecoder();
+
 export function useReplayStream(
   matchId: string | null,
   replayReady: boolean,
@@ -15,17 +20,38 @@ export function useReplayStream(
 ) {
   const [data, setData] = useState<MatchDataMessage | null>(null);
   const [ended, setEnded] = useState(false);
-  const latestFrame = useRef<ArrayBuffer | null>(null);
+  const latestFrame = useRef<Uint8Array | null>(null);
   const rafId = useRef(0);
   const mountedRef = useRef(true);
 
   // Suppress reconnection when replay has ended by passing url: null
-  const url = matchId && replayReady && !ended ? `${WS_BASE}/ws/replay/${matchId}` : null;
+  const url =
+    matchId && replayReady && !ended ? `${WS_BASE}/ws/replay/${matchId}?coalesce=1` : null;
+
+  const onText = useCallback((text: string) => {
+    try {
+      const msg = JSON.parse(text);
+      if (msg.status === "ended") {
+        setEnded(true);
+      } else {
+        setData(msg as MatchDataMessage);
+      }
+    } catch {
+      // Ignore parse errors
+    }
+  }, []);
 
   const onMessage = useCallback(
     (event: MessageEvent) => {
       if (event.data instanceof ArrayBuffer) {
-        latestFrame.current = event.data;
+        const buf: ArrayBuffer = event.data;
+        let frameBytes = new Uint8Array(buf);
+        if (frameBytes[0] === TYPE_FRAME_DATA) {
+          const jpegLen = new DataView(buf).getUint32(1);
+          frameBytes = new Uint8Array(buf, 5, jpegLen);
+          onText(textDecoder.decode(new Uint8Array(buf, 5 + jpegLen)));
+        }
+        latestFrame.current = frameBytes;
         if (!rafId.current) {
           rafId.current = requestAnimationFrame(() => {
             rafId.current = 0;
@@ -48,19 +74,10 @@ export function useReplayStream(
           });
         }
       } else {
-        try {
-          const msg = JSON.parse(event.data);
-          if (msg.status === "ended") {
-            setEnded(true);
-          } else {
-            setData(msg as MatchDataMessage);
-          }
-        } catch {
-          // Ignore parse errors
-        }
+        onText(event.data);
       }
     },
-    [canvasRef],
+    [canvasRef, onText],
   );
 
   const { connected } = useReconnectingWebSocket({